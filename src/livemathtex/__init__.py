@@ -25,14 +25,33 @@ Example:
     >>> print(output)
 """
 
-from .cli import main
-from .config import LivemathConfig
-from .core import clear_text, detect_error_markup, process_file, process_text, process_text_v3
-from .ir import LivemathIR
-from .ir.schema import LivemathIRV3
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cli import main
+    from .config import LivemathConfig
+    from .core import clear_text, detect_error_markup, process_file, process_text, process_text_v3
+    from .ir import LivemathIR
+    from .ir.schema import LivemathIRV3
 
 __version__ = "0.1.0"
 
+# Public name -> submodule that defines it.
+# Resolved on first attribute access (PEP 562) so that `import livemathtex`
+# does not pull in Pint, Click and the parser until they are actually used.
+_LAZY_EXPORTS = {
+    "process_text": ".core",
+    "process_text_v3": ".core",
+    "process_file": ".core",
+    "clear_text": ".core",
+    "detect_error_markup": ".core",
+    "LivemathConfig": ".config",
+    "LivemathIR": ".ir",
+    "LivemathIRV3": ".ir.schema",
+    "main": ".cli",
+}
+
 __all__ = [
     # Processing functions
     "process_text",
@@ -50,3 +69,16 @@ __all__ = [
     # Metadata
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
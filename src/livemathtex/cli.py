@@ -1,25 +1,50 @@
-import re
+import hashlib
+import os
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
-from .config import LivemathConfig
-from .core import clear_text, process_file, process_text_v3
-from .ir.schema import LivemathIRV3
-from .parser.lexer import Lexer
+from .utils.fileio import read_document, write_document
+
+# The pipeline (engine, Pint, IR) is imported inside the commands that use
+# it, so `--help` and `inspect` do not pay for loading it.
+if TYPE_CHECKING:
+    from .config import LivemathConfig
+
+# Styled output fragments, built once (click.echo strips the ANSI codes
+# when stdout is not a terminal)
+_ERRORS_TEMPLATE = click.style("  Errors: {}", fg='red')
+_NO_ERRORS = click.style("  Errors: 0", fg='green')
+_ERRORS_HEADER = click.style("Errors:", fg='red')
 
 
 @click.group()
-def main():
+@click.pass_context
+def main(ctx):
     """Livemathtex CLI - Live mathematical calculations in LaTeX/Markdown."""
-    pass
+    # One footer timestamp per CLI run, shared by the subcommands
+    ctx.ensure_object(dict)["run_timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _run_timestamp() -> str:
+    """Timestamp of the current CLI run (formatted once in main), or now."""
+    ctx = click.get_current_context(silent=True)
+    obj = ctx.find_object(dict) if ctx is not None else None
+    if obj and "run_timestamp" in obj:
+        return obj["run_timestamp"]
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
 
 @main.command()
 @click.argument('input_file', type=click.Path(exists=True))
 @click.option('-o', '--output', type=click.Path(), help="Output file path")
 @click.option('-v', '--verbose', is_flag=True, help="Write IR v3.0 to JSON file for debugging")
 @click.option('--ir-output', type=click.Path(), help="Custom path for IR JSON (default: input.lmt.json)")
-def process(input_file, output, verbose, ir_output):
+@click.option('--skip-unchanged', is_flag=True,
+              help="Skip processing if input, config and options are unchanged since the last run")
+def process(input_file, output, verbose, ir_output, skip_unchanged):
     """Process a markdown file and execute calculations.
 
     Examples:
@@ -28,6 +53,12 @@ def process(input_file, output, verbose, ir_output):
         livemathtex process input.md -o output.md
         livemathtex process input.md --verbose
         livemathtex process input.md -v --ir-output debug.json
+        livemathtex process input.md --skip-unchanged
+
+    With --skip-unchanged, a hash of the input, the effective config, the
+    options and the livemathtex version is kept in input.lmt.hash, together
+    with a hash of each file written; if the input hash matches and those
+    files are unchanged, processing is skipped.
 
     The --verbose flag can also be enabled via document directive:
 
@@ -35,69 +66,284 @@ def process(input_file, output, verbose, ir_output):
 
     When --verbose is used, generates IR v3.0 JSON with Pint-based unit conversion.
     """
+    from .config import LivemathConfig
+    from .parser.lexer import parse_document_directives
+
     try:
         # Check document directive for json
         input_path = Path(input_file)
-        with open(input_path, encoding='utf-8') as f:
-            content = f.read()
+        content = read_document(input_path)
 
-        lexer = Lexer()
-        doc_directives = lexer.parse_document_directives(content)
+        doc_directives = parse_document_directives(content)
         config = LivemathConfig.load(input_path).with_overrides(doc_directives)
 
         # CLI --verbose OR document json=true
         should_generate_ir = verbose or config.json
 
+        if skip_unchanged:
+            hash_path = input_path.with_suffix('.lmt.hash')
+            options = (output, should_generate_ir, ir_output)
+            if _is_unchanged(hash_path, _process_digest(content, config, *options)):
+                click.echo(f"✓ Unchanged {input_file} (skipped)")
+                return
+            # Resolve the output path once, so the path recorded in the hash
+            # file is the one written (timestamped names change every minute)
+            output = str(config.resolve_output_path(input_path, output).absolute())
+
+        ir, ir_path = _run_pipeline(
+            input_file, content, config, output, should_generate_ir, ir_output
+        )
+
+        # Show summary (collected and written with a single echo)
+        stats = ir.stats
+        symbols, definitions, evaluations, symbolic, errors = (
+            stats.get(key, 0)
+            for key in ('symbols', 'definitions', 'evaluations', 'symbolic', 'errors')
+        )
+        summary = [
+            f"✓ Processed {input_file}",
+            f"  Symbols: {symbols}",
+        ]
+        if 'custom_units' in stats:
+            summary.append(f"  Custom units: {stats['custom_units']}")
+        summary.append(f"  Definitions (:=): {definitions}")
+        summary.append(f"  Evaluations (==): {evaluations}")
+        summary.append(f"  Symbolic (=>):    {symbolic}")
+
+        summary.append(_ERRORS_TEMPLATE.format(errors) if errors > 0 else _NO_ERRORS)
+
+        summary.append(f"  Duration: {stats.get('duration', 'N/A')}")
+
         if should_generate_ir:
-            # Use v3.0 pipeline for JSON generation
-            from .engine import reset_unit_registry
-            reset_unit_registry()
+            # ir_path was resolved when writing the IR; echo --ir-output as given
+            summary.append(f"  IR v3.0 written to: {ir_output or ir_path}")
 
-            rendered_output, ir = process_text_v3(content, source=str(input_path), config=config)
+        click.echo("\n".join(summary))
 
-            # Write output markdown
-            # Match legacy pipeline behavior: resolve relative -o paths next to the input file
-            output_path = config.resolve_output_path(input_path, output)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(rendered_output)
+        if skip_unchanged:
+            output_path = Path(output)
+            if output_path.resolve() == input_path.resolve():
+                # In place: the next run reads the processed document
+                content = read_document(input_path)
+            written = [output_path, ir_path] if ir_path else [output_path]
+            _write_hash_file(hash_path, _process_digest(content, config, *options), written)
 
-            # Write IR JSON (v3.0)
-            ir_path = Path(ir_output) if ir_output else input_path.with_suffix('.lmt.json')
-            ir.to_json(ir_path)
-        else:
-            # Use standard v2.0 pipeline (no JSON output)
-            ir = process_file(
-                input_file,
-                output,
-                verbose=False,
-                ir_output_path=ir_output
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+
+
+def _run_pipeline(input_file: str, content: str, config: "LivemathConfig",
+                  output: str | None, should_generate_ir: bool, ir_output: str | None):
+    """
+    Run the pipeline for one document and write its outputs.
+
+    Uses the v3.0 pipeline (with IR JSON) when should_generate_ir is set,
+    the standard v2.0 pipeline otherwise.
+
+    Returns:
+        Tuple of (ir, ir_path); ir_path is None when no IR JSON is written.
+    """
+    from .core import process_file, process_text_v3
+
+    input_path = Path(input_file)
+
+    if should_generate_ir:
+        # Use v3.0 pipeline for JSON generation
+        from .engine import reset_unit_registry
+        reset_unit_registry()
+
+        rendered_output, ir = process_text_v3(content, source=str(input_path), config=config)
+
+        # Write output markdown
+        # Match legacy pipeline behavior: resolve relative -o paths next to the input file
+        output_path = config.resolve_output_path(input_path, output)
+        write_document(output_path, rendered_output)
+
+        # Write IR JSON (v3.0)
+        ir_path = Path(ir_output) if ir_output else input_path.with_suffix('.lmt.json')
+        ir.to_json(ir_path)
+        return ir, ir_path
+
+    # Use standard v2.0 pipeline (no JSON output)
+    # Pass the already-read content so the file is not read twice
+    ir = process_file(
+        input_file,
+        output,
+        verbose=False,
+        ir_output_path=ir_output,
+        content=content,
+    )
+    return ir, None
+
+
+def _process_one(input_file: str, verbose: bool = False) -> tuple[str, dict | None, str | None]:
+    """
+    Process one file for process-many.
+
+    Module-level so it can be sent to worker processes.
+
+    Returns:
+        Tuple of (input_file, stats, error message); stats is None on failure.
+    """
+    from .config import LivemathConfig
+    from .engine import reset_unit_registry
+    from .parser.lexer import parse_document_directives
+
+    try:
+        content = read_document(input_file)
+        doc_directives = parse_document_directives(content)
+        config = LivemathConfig.load(Path(input_file)).with_overrides(doc_directives)
+
+        # Workers handle several files: start each from a clean unit registry,
+        # as a separate `livemathtex process` run would
+        reset_unit_registry()
+
+        ir, _ir_path = _run_pipeline(
+            input_file, content, config, None, verbose or config.json, None
+        )
+        return input_file, ir.stats, None
+    except Exception as e:
+        return input_file, None, str(e)
+
+
+@main.command('process-many')
+@click.argument('input_files', nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option('-j', '--jobs', type=click.IntRange(min=1),
+              help="Number of worker processes (default: number of CPUs)")
+@click.option('-v', '--verbose', is_flag=True, help="Write IR v3.0 JSON next to each input")
+def process_many(input_files, jobs, verbose):
+    """Process several markdown files in parallel.
+
+    Each file is written to the output selected by its config and document
+    directives, exactly as `livemathtex process FILE` would.
+
+    Examples:
+
+        livemathtex process-many docs/*.md
+        livemathtex process-many -j 4 a.md b.md c.md
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(input_files))
+
+    if jobs == 1:
+        results = map(_process_one, input_files, [verbose] * len(input_files))
+        failed, total_errors = _report_many(results)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                _process_one, input_files, [verbose] * len(input_files), chunksize=4
             )
+            failed, total_errors = _report_many(results)
 
-        # Show summary
-        stats = ir.stats
-        click.echo(f"✓ Processed {input_file}")
-        click.echo(f"  Symbols: {stats.get('symbols', 0)}")
-        if 'custom_units' in stats:
-            click.echo(f"  Custom units: {stats.get('custom_units', 0)}")
-        click.echo(f"  Definitions (:=): {stats.get('definitions', 0)}")
-        click.echo(f"  Evaluations (==): {stats.get('evaluations', 0)}")
-        click.echo(f"  Symbolic (=>):    {stats.get('symbolic', 0)}")
+    processed = len(input_files) - failed
+    summary = f"Processed {processed}/{len(input_files)} files"
+    if total_errors:
+        summary += click.style(f" ({total_errors} calculation errors)", fg='red')
+    click.echo(summary)
 
+    if failed:
+        raise SystemExit(1)
+
+
+def _report_many(results) -> tuple[int, int]:
+    """Echo one line per process-many result; return (failed files, calculation errors)."""
+    failed = 0
+    total_errors = 0
+    for input_file, stats, error in results:
+        if error is not None:
+            failed += 1
+            click.echo(click.style(f"✗ {input_file}: {error}", fg='red'), err=True)
+            continue
         errors = stats.get('errors', 0)
-        if errors > 0:
-            click.echo(click.style(f"  Errors: {errors}", fg='red'))
+        total_errors += errors
+        if errors:
+            click.echo(f"✓ Processed {input_file} " + click.style(f"(errors: {errors})", fg='red'))
         else:
-            click.echo(click.style("  Errors: 0", fg='green'))
+            click.echo(f"✓ Processed {input_file}")
+    return failed, total_errors
 
-        click.echo(f"  Duration: {stats.get('duration', 'N/A')}")
 
-        if should_generate_ir:
-            ir_path = ir_output or str(Path(input_file).with_suffix('.lmt.json'))
-            click.echo(f"  IR v3.0 written to: {ir_path}")
+def _process_digest(content: str, config: "LivemathConfig", *options) -> str:
+    """Hash the document text, effective config, CLI options and version for --skip-unchanged."""
+    from . import __version__
+
+    h = hashlib.blake2b(content.encode('utf-8'), digest_size=16)
+    h.update(repr((__version__, config, options)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _file_digest(path: Path) -> str | None:
+    """Hash the bytes of a written output file (None if it does not exist)."""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _write_hash_file(hash_path: Path, digest: str, outputs: list[Path]) -> None:
+    """
+    Record a --skip-unchanged run: the input digest, then one
+    "<file hash> <path>" line per output file written.
+    """
+    lines = [digest]
+    lines.extend(f"{_file_digest(path)} {path.absolute()}" for path in outputs)
+    hash_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
 
-    except Exception as e:
-        click.echo(f"Error: {e}", err=True)
-        raise SystemExit(1)
+
+def _is_unchanged(hash_path: Path, digest: str) -> bool:
+    """Whether hash_path records digest and every recorded output is untouched."""
+    try:
+        digest_line, *output_lines = hash_path.read_text(encoding='utf-8').splitlines()
+    except (FileNotFoundError, ValueError):
+        return False
+    if digest_line != digest or not output_lines:
+        return False
+    for line in output_lines:
+        file_hash, _, path = line.partition(" ")
+        if _file_digest(Path(path)) != file_hash:
+            return False
+    return True
+
+
+def _format_value(value, unit_template: str) -> str:
+    """Format a ValueWithUnit for inspect output ("" if there is no value)."""
+    if value.value is None:
+        return ""
+    if value.unit:
+        return f"{value.value}{unit_template.format(value.unit)}"
+    return f"{value.value}"
+
+
+def _format_symbol_v3(clean_id: str, entry) -> list[str]:
+    """Format one v3.0 SymbolEntryV3 as inspect output lines."""
+    lines = [f"  {clean_id} ({entry.latex_name}):"]
+    orig_str = _format_value(entry.original, " {}")
+    if orig_str:
+        lines.append(f"    original: {orig_str}")
+    base_str = _format_value(entry.base, " [{}]")
+    if base_str:
+        lines.append(f"    base: {base_str}")
+    if entry.formula:
+        lines.append(f"    formula: {entry.formula.expression}")
+        lines.append(f"    depends_on: {entry.formula.depends_on}")
+    lines.append(f"    conversion_ok: {'✓' if entry.conversion_ok else '✗'}")
+    return lines
+
+
+def _format_symbol_v2(name: str, entry) -> list[str]:
+    """Format one v2.0 SymbolEntry as inspect output lines."""
+    lines = [f"  {name}:", f"    id: {entry.id}"]
+    orig_str = _format_value(entry.original, " {}")
+    if orig_str:
+        lines.append(f"    original: {orig_str}")
+    si_str = _format_value(entry.si, " [{}]")
+    if si_str:
+        lines.append(f"    SI: {si_str}")
+    lines.append(f"    valid: {'✓' if entry.valid else '✗'}")
+    return lines
 
 
 @main.command()
@@ -107,137 +353,106 @@ def inspect(ir_file):
 
     Shows symbols with their original and base/SI values.
     """
-    import json
-
-    from .ir import LivemathIR
+    from .ir.schema import LivemathIR, LivemathIRV3, load_json
 
     try:
         # Read JSON to detect version
-        with open(ir_file, encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(ir_file)
 
         version = data.get('version', '2.0')
 
+        # Output is collected and written with a single echo at the end
+        buf: list[str] = []
+
         if version == '3.0':
             # Load as v3.0
             ir = LivemathIRV3.from_dict(data)
+            format_symbol = _format_symbol_v3
 
-            click.echo(f"Source: {ir.source}")
-            click.echo(f"Version: {ir.version}")
+            buf.append(f"Source: {ir.source}")
+            buf.append(f"Version: {ir.version}")
             if ir.unit_backend:
-                click.echo(f"Unit backend: {ir.unit_backend.get('name', 'N/A')} {ir.unit_backend.get('version', '')}")
-            click.echo()
+                buf.append(f"Unit backend: {ir.unit_backend.get('name', 'N/A')} {ir.unit_backend.get('version', '')}")
+            buf.append("")
 
             # Custom units (v3.0 with full metadata)
-            if ir.custom_units:
-                click.echo("Custom Units:")
-                for name, entry in ir.custom_units.items():
-                    click.echo(f"  {name}:")
-                    click.echo(f"    type: {entry.type}")
-                    click.echo(f"    definition: {entry.pint_definition}")
-                click.echo()
-
-            # Symbols (v3.0 structure)
-            if ir.symbols:
-                click.echo("Symbols:")
-                for clean_id, entry in ir.symbols.items():
-                    # Format original value
-                    orig = entry.original
-                    orig_str = ""
-                    if orig.value is not None:
-                        orig_str = f"{orig.value}"
-                        if orig.unit:
-                            orig_str += f" {orig.unit}"
-
-                    # Format base value
-                    base = entry.base
-                    base_str = ""
-                    if base.value is not None:
-                        base_str = f"{base.value}"
-                        if base.unit:
-                            base_str += f" [{base.unit}]"
-
-                    # Validation status
-                    valid_mark = "✓" if entry.conversion_ok else "✗"
-
-                    # Display
-                    click.echo(f"  {clean_id} ({entry.latex_name}):")
-                    if orig_str:
-                        click.echo(f"    original: {orig_str}")
-                    if base_str:
-                        click.echo(f"    base: {base_str}")
-                    if entry.formula:
-                        click.echo(f"    formula: {entry.formula.expression}")
-                        click.echo(f"    depends_on: {entry.formula.depends_on}")
-                    click.echo(f"    conversion_ok: {valid_mark}")
-                click.echo()
-
+            custom_units = ir.custom_units
+            if custom_units:
+                buf.append("Custom Units:")
+                buf.extend(
+                    line
+                    for name, entry in custom_units.items()
+                    for line in (
+                        f"  {name}:",
+                        f"    type: {entry.type}",
+                        f"    definition: {entry.pint_definition}",
+                    )
+                )
+                buf.append("")
         else:
             # Load as v2.0
             ir = LivemathIR.from_dict(data)
+            format_symbol = _format_symbol_v2
 
-            click.echo(f"Source: {ir.source}")
-            click.echo(f"Version: {ir.version}")
-            click.echo()
+            buf.append(f"Source: {ir.source}")
+            buf.append(f"Version: {ir.version}")
+            buf.append("")
 
             # Custom units (v2.0 simple strings)
-            if ir.custom_units:
-                click.echo("Custom Units:")
-                for name, definition in ir.custom_units.items():
-                    click.echo(f"  {name} = {definition}")
-                click.echo()
-
-            # Symbols (v2.0 structure)
-            if ir.symbols:
-                click.echo("Symbols:")
-                for name, entry in ir.symbols.items():
-                    # Format original value
-                    orig = entry.original
-                    orig_str = ""
-                    if orig.value is not None:
-                        orig_str = f"{orig.value}"
-                        if orig.unit:
-                            orig_str += f" {orig.unit}"
-
-                    # Format SI value
-                    si = entry.si
-                    si_str = ""
-                    if si.value is not None:
-                        si_str = f"{si.value}"
-                        if si.unit:
-                            si_str += f" [{si.unit}]"
-
-                    # Validation status
-                    valid_mark = "✓" if entry.valid else "✗"
-
-                    # Display
-                    click.echo(f"  {name}:")
-                    click.echo(f"    id: {entry.id}")
-                    if orig_str:
-                        click.echo(f"    original: {orig_str}")
-                    if si_str:
-                        click.echo(f"    SI: {si_str}")
-                    click.echo(f"    valid: {valid_mark}")
-                click.echo()
+            custom_units = ir.custom_units
+            if custom_units:
+                buf.append("Custom Units:")
+                buf.extend(f"  {name} = {definition}" for name, definition in custom_units.items())
+                buf.append("")
+
+        # Bind the IR collections once for the loops below
+        symbols, errors, stats = ir.symbols, ir.errors, ir.stats
+
+        # Symbols (keyed by clean ID in v3.0, by LaTeX name in v2.0)
+        if symbols:
+            buf.append("Symbols:")
+            for key, entry in symbols.items():
+                buf.extend(format_symbol(key, entry))
+            buf.append("")
 
         # Errors (same structure in v2.0 and v3.0)
-        if ir.errors:
-            click.echo(click.style("Errors:", fg='red'))
-            for error in ir.errors:
-                click.echo(f"  Line {error.line}: {error.message}")
-            click.echo()
+        if errors:
+            buf.append(_ERRORS_HEADER)
+            buf.extend(f"  Line {error.line}: {error.message}" for error in errors)
+            buf.append("")
 
         # Stats
-        if ir.stats:
-            click.echo("Stats:")
-            for key, value in ir.stats.items():
-                click.echo(f"  {key}: {value}")
+        if stats:
+            buf.append("Stats:")
+            buf.extend(f"  {key}: {value}" for key, value in stats.items())
+
+        click.echo("\n".join(buf))
 
     except Exception as e:
         click.echo(f"Error reading IR file: {e}", err=True)
         raise SystemExit(1)
 
 
+def _cleared_summary(count: int) -> str:
+    """Footer summary for clear/copy: "cleared N evaluation(s)"."""
+    return f"cleared {count} evaluation{'s' if count != 1 else ''}"
+
+
+def _with_footer(text: str, summary: str) -> str:
+    """
+    Return text with trailing whitespace removed and a metadata footer appended.
+
+    The footer has the same format as the one written by process, built in a
+    single join rather than via intermediate concatenations.
+    """
+    now_str = _run_timestamp()
+    return "".join((
+        text.rstrip(),
+        f"\n\n---\n\n> *livemathtex: {now_str} | {summary} | no errors | <1s*",
+        " <!-- livemathtex-meta -->\n",
+    ))
+
+
 @main.command()
 @click.argument('input_file', type=click.Path(exists=True))
 @click.option('-o', '--output', type=click.Path(), help="Output file path (default: overwrite input)")
@@ -263,31 +478,26 @@ def clear(input_file, output):
         $kN === 1000 N$ (unit definitions)
         <!-- [kJ] --> (unit hints)
     """
-    try:
-        from datetime import datetime
+    from .core import clear_text
 
+    try:
         input_path = Path(input_file)
-        with open(input_path, encoding='utf-8') as f:
-            content = f.read()
+        content = read_document(input_path)
 
         cleared, count = clear_text(content)
 
         # Add metadata footer (same format as process command)
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        metadata_footer = f"\n\n---\n\n> *livemathtex: {now_str} | cleared {count} evaluation{'s' if count != 1 else ''} | no errors | <1s* <!-- livemathtex-meta -->\n"
-
-        # Remove any trailing whitespace/newlines before adding footer
-        cleared = cleared.rstrip()
-        cleared_with_metadata = cleared + metadata_footer
+        cleared_with_metadata = _with_footer(cleared, _cleared_summary(count))
 
         # Determine output path (default: overwrite input)
         output_path = Path(output) if output else input_path
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(cleared_with_metadata)
+        write_document(output_path, cleared_with_metadata)
 
-        click.echo(f"✓ Cleared {input_file}")
-        click.echo(f"  Evaluations cleared: {count}")
-        click.echo(f"  Output: {output_path}")
+        click.echo(
+            f"✓ Cleared {input_file}\n"
+            f"  Evaluations cleared: {count}\n"
+            f"  Output: {output_path}"
+        )
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -312,16 +522,18 @@ def copy(file):
         # If output.md points to itself, clears computed values (inplace)
         # If output.md points elsewhere, copies to that location
     """
+    from .config import LivemathConfig
+    from .core import META_FOOTER_RE, clear_text
+    from .parser.lexer import parse_document_directives
+
     try:
         file_path = Path(file)
 
         # Read the file to check its directive
-        with open(file_path, encoding='utf-8') as f:
-            content = f.read()
+        content = read_document(file_path)
 
         # Parse document directive to understand the relationship
-        lexer = Lexer()
-        doc_directives = lexer.parse_document_directives(content)
+        doc_directives = parse_document_directives(content)
         config = LivemathConfig.load(file_path).with_overrides(doc_directives)
 
         # Resolve what the output path would be
@@ -330,43 +542,31 @@ def copy(file):
         # Determine behavior based on directive
         if output_path == file_path:
             # File points to itself - treat as inplace and clear computed values
-            from datetime import datetime
-
             cleared, count = clear_text(content)
 
             # Add metadata footer (same format as process command)
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            metadata_footer = f"\n\n---\n\n> *livemathtex: {now_str} | cleared {count} evaluation{'s' if count != 1 else ''} | no errors | <1s* <!-- livemathtex-meta -->\n"
-
-            # Remove any trailing whitespace/newlines before adding footer
-            cleared = cleared.rstrip()
-            cleared_with_metadata = cleared + metadata_footer
+            cleared_with_metadata = _with_footer(cleared, _cleared_summary(count))
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(cleared_with_metadata)
-            click.echo(f"✓ Cleared computed values from {file_path.name} (inplace)")
-            click.echo(f"  Evaluations cleared: {count}")
+            write_document(file_path, cleared_with_metadata)
+            click.echo(
+                f"✓ Cleared computed values from {file_path.name} (inplace)\n"
+                f"  Evaluations cleared: {count}"
+            )
         else:
             # File points to a different file - copy this file to that output
             # Add metadata footer to indicate copy operation
-            from datetime import datetime
-
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # Remove any existing metadata first
-            content_cleaned = re.sub(
-                r'\n+---\n+>\s*\*livemathtex:[^*]+\*\s*<!--\s*livemathtex-meta\s*-->\n*',
-                '\n',
-                content
-            ).rstrip()
-
-            metadata_footer = f"\n\n---\n\n> *livemathtex: {now_str} | copied from {file_path.name} | no errors | <1s* <!-- livemathtex-meta -->\n"
-            content_with_metadata = content_cleaned + metadata_footer
-
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content_with_metadata)
-            click.echo(f"✓ Copied {file_path.name} to {output_path.name}")
-            click.echo(f"  Source: {file_path}")
-            click.echo(f"  Output: {output_path}")
+            # Remove any existing metadata first (the regex can only match
+            # if the livemathtex-meta marker is present)
+            if 'livemathtex-meta' in content:
+                content = META_FOOTER_RE.sub('\n', content)
+            content_with_metadata = _with_footer(content, f"copied from {file_path.name}")
+
+            write_document(output_path, content_with_metadata)
+            click.echo(
+                f"✓ Copied {file_path.name} to {output_path.name}\n"
+                f"  Source: {file_path}\n"
+                f"  Output: {output_path}"
+            )
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -17,24 +17,63 @@ the same output regardless of who processes it. Therefore, CLI options do NOT
 include formatting settings - only operational flags like -o for output path.
 """
 
+import os
 import sys
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
 from enum import Enum
+from functools import cache, lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Any, Literal
 
-# Python 3.11+ has tomllib built-in, older versions need tomli
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
-
 # Type aliases for configuration values
 FormatType = Literal["general", "decimal", "scientific", "engineering"]
 UnitSystem = Literal["SI", "imperial", "CGS"]
 
 
+@cache
+def _get_tomllib():
+    """
+    Import the TOML parser on first use.
+
+    Python 3.11+ has tomllib built-in, older versions need tomli. Deferred
+    so that runs without any config file never import it.
+    """
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+    return tomllib
+
+
+@lru_cache(maxsize=32)
+def _parse_toml_file(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """
+    Parse a TOML file, memoized on (path, mtime_ns, size).
+
+    The mtime and size are only part of the cache key, so an edited file is
+    parsed again. Callers must treat the returned dict as read-only.
+    """
+    with open(path, "rb") as f:
+        return _get_tomllib().load(f)
+
+
+@lru_cache(maxsize=64)
+def _find_pyproject_from(directory: str) -> Path | None:
+    """
+    Find pyproject.toml in directory or its ancestors (memoized per directory).
+
+    Stops at the first match instead of materializing the parent chain.
+    """
+    current = Path(directory)
+    for parent in chain((current,), current.parents):
+        pyproject = parent / "pyproject.toml"
+        if pyproject.exists():
+            return pyproject
+    return None
+
+
 class UnitFormat(Enum):
     """Unit display format options (ISS-042).
 
@@ -48,13 +87,14 @@ class UnitFormat(Enum):
     EXPONENT = "exponent"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LivemathConfig:
     """
     Immutable configuration for livemathtex processing.
 
     This dataclass holds all configuration options. It is immutable (frozen=True)
-    to ensure configuration doesn't change unexpectedly during processing.
+    to ensure configuration doesn't change unexpectedly during processing, and
+    uses slots=True so instances carry no per-instance __dict__.
     Use with_overrides() to create a new config with modified values.
 
     Attributes:
@@ -104,10 +144,10 @@ class LivemathConfig:
             >>> new_config.digits
             6
         """
-        # Filter to only valid attributes that are not None
+        # Filter to only config fields (not methods) that are not None
         valid = {}
         for k, v in overrides.items():
-            if not hasattr(self, k) or v is None:
+            if k not in _FIELD_NAMES or v is None:
                 continue
             # Handle enum conversion for unit_format
             if k == 'unit_format' and isinstance(v, str):
@@ -181,26 +221,82 @@ class LivemathConfig:
 
         Returns:
             LivemathConfig with all file-based settings applied.
+
+        Note:
+            Results are memoized per set of config files found, keyed on each
+            file's path, mtime and size. Documents sharing the same config
+            files reuse one parse; editing a config file invalidates it.
         """
-        config = cls()  # Start with defaults
+        # Collect (kind, path, mtime_ns, size) for each config file that applies,
+        # lowest priority first
+        sources: list[tuple[str, str, int, int]] = []
+
+        # Each config file costs one stat call: _source_key() returns None
+        # for a missing file instead of checking exists() first.
 
         # 1. User config (~/.config/livemathtex/config.toml)
         user_config = Path.home() / ".config" / "livemathtex" / "config.toml"
-        if user_config.exists():
-            config = config.with_overrides(cls._load_toml(user_config))
+        key = cls._source_key("toml", user_config)
+        if key:
+            sources.append(key)
 
-        # 2. Project config (find pyproject.toml going up from document)
         if document_path:
+            # 2. Project config (find pyproject.toml going up from document)
             pyproject = cls._find_pyproject(document_path)
             if pyproject:
-                config = config.with_overrides(cls._load_pyproject(pyproject))
+                key = cls._source_key("pyproject", pyproject)
+                if key is None:
+                    # Removed since the lookup was cached: search again
+                    _find_pyproject_from.cache_clear()
+                    pyproject = cls._find_pyproject(document_path)
+                    key = pyproject and cls._source_key("pyproject", pyproject)
+                if key:
+                    sources.append(key)
+
+            # 3. Local config (.livemathtex.toml in document directory)
+            key = cls._source_key("toml", document_path.parent / ".livemathtex.toml")
+            if key:
+                sources.append(key)
+
+        if not sources and cls is LivemathConfig:
+            # Common case: no config files at all, defaults apply
+            return _DEFAULT_CONFIG
+        return cls._load_sources(tuple(sources))
 
-        # 3. Local config (.livemathtex.toml in document directory)
-        if document_path:
-            local_config = document_path.parent / ".livemathtex.toml"
-            if local_config.exists():
-                config = config.with_overrides(cls._load_toml(local_config))
+    @staticmethod
+    def _source_key(kind: str, path: Path) -> tuple[str, str, int, int] | None:
+        """
+        Build the cache key for one config file: (kind, path, mtime_ns, size).
+
+        Returns None if the file does not exist (a single os.stat call).
+        """
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return (kind, str(path), stat.st_mtime_ns, stat.st_size)
 
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _load_sources(
+        cls, sources: tuple[tuple[str, str, int, int], ...]
+    ) -> "LivemathConfig":
+        """
+        Build a config by applying config files in order (memoized).
+
+        Args:
+            sources: Tuple of (kind, path, mtime_ns, size) as built by
+                     _source_key(); kind is "toml" or "pyproject".
+
+        Returns:
+            LivemathConfig with the settings of all sources applied.
+        """
+        config = cls()  # Start with defaults
+        for kind, path, mtime_ns, size in sources:
+            data = _parse_toml_file(path, mtime_ns, size)
+            if kind == "pyproject":
+                data = data.get("tool", {}).get("livemathtex", {})
+            config = config.with_overrides(cls._load_toml_dict(data))
         return config
 
     @staticmethod
@@ -216,20 +312,9 @@ class LivemathConfig:
         Returns:
             Flattened dictionary of configuration values
         """
-        with open(path, "rb") as f:
-            data = tomllib.load(f)
-
-        # Flatten [units] section to top-level keys
-        result = {}
-        for key, value in data.items():
-            if key == "units" and isinstance(value, dict):
-                if "system" in value:
-                    result["unit_system"] = value["system"]
-                if "simplify" in value:
-                    result["simplify_units"] = value["simplify"]
-            else:
-                result[key] = value
-        return result
+        stat = path.stat()
+        data = _parse_toml_file(str(path), stat.st_mtime_ns, stat.st_size)
+        return LivemathConfig._load_toml_dict(data)
 
     @staticmethod
     def _load_pyproject(path: Path) -> dict[str, Any]:
@@ -242,8 +327,8 @@ class LivemathConfig:
         Returns:
             Dictionary of livemathtex settings, or empty dict if section missing
         """
-        with open(path, "rb") as f:
-            data = tomllib.load(f)
+        stat = path.stat()
+        data = _parse_toml_file(str(path), stat.st_mtime_ns, stat.st_size)
         return LivemathConfig._load_toml_dict(
             data.get("tool", {}).get("livemathtex", {})
         )
@@ -282,8 +367,25 @@ class LivemathConfig:
             Path to pyproject.toml if found, None otherwise
         """
         current = start.parent if start.is_file() else start
-        for parent in [current] + list(current.parents):
-            pyproject = parent / "pyproject.toml"
-            if pyproject.exists():
-                return pyproject
-        return None
+        return _find_pyproject_from(str(current))
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drop all cached config lookups and parsed config files.
+
+        Edited config files are picked up automatically (the caches are
+        keyed on mtime and size); this is only needed when a new
+        pyproject.toml appears above a directory that was already searched.
+        """
+        LivemathConfig._load_sources.cache_clear()
+        _parse_toml_file.cache_clear()
+        _find_pyproject_from.cache_clear()
+
+
+# Names of the config fields, for filtering overrides in with_overrides()
+_FIELD_NAMES = frozenset(f.name for f in fields(LivemathConfig))
+
+# Shared default config (frozen, so safe to share), returned by load()
+# when no config file applies
+_DEFAULT_CONFIG = LivemathConfig()
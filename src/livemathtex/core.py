@@ -18,7 +18,7 @@ Version 3.0:
 
 import re
 import time
-from datetime import datetime
+from collections import Counter
 from pathlib import Path
 
 from .config import LivemathConfig
@@ -26,9 +26,239 @@ from .engine.evaluator import Evaluator
 from .ir import IRBuilder, LivemathIR, SymbolEntry, ValueWithUnit
 from .ir.schema import FormulaInfo, LivemathIRV3, SymbolEntryV3
 from .parser.lexer import Lexer
-from .parser.models import MathBlock
+from .parser.models import Document
 from .parser.reference_parser import extract_references, restore_references
 from .render.markdown import MarkdownRenderer
+from .utils.fileio import read_document, write_document
+
+# The lexer, IR builder and renderer hold no per-document state, so one
+# instance of each serves all calls
+_LEXER = Lexer()
+_IR_BUILDER = IRBuilder()
+_RENDERER = MarkdownRenderer()
+
+# livemathtex metadata footer written by process/clear/copy:
+# ---
+# > *livemathtex: timestamp | stats | errors | duration* <!-- livemathtex-meta -->
+META_FOOTER_RE = re.compile(
+    r'\n+---\n+>\s*\*livemathtex:[^*]+\*\s*<!--\s*livemathtex-meta\s*-->\n*'
+)
+
+# Markup cleanup patterns used by clear_text() and _clear_text_regex(),
+# compiled once at import instead of on every call.
+# \color{red}{...} / \color{orange}{...} with one level of nested braces
+_ERROR_RE = re.compile(r'\\color\{red\}\{(?:[^{}]|\{[^{}]*\})*\}')
+_WARNING_RE = re.compile(r'\\color\{orange\}\{(?:[^{}]|\{[^{}]*\})*\}')
+# Inline error text: \text{(Error: ...)}
+_ERROR_TEXT_RE = re.compile(r'\\text\{\(Error:[^)]*\)\}')
+# Orphaned line continuations before the closing $: \\ }$ and \\ $
+_ORPHAN_BRACE_RE = re.compile(r'\n?\\\\\s*\}\$')
+_ORPHAN_NL_RE = re.compile(r'\n\\\\\s*\$')
+# Definitions left ending in newlines: $expr := value\n$
+_INCOMPLETE_DEF_RE = re.compile(r'(\$[^$]+:=\s*[^\n$]+)\n+\$')
+# Whitespace between == and the closing $: `$bad == $`
+_TRAILING_WS_EVAL_RE = re.compile(r'(==)\s+\$')
+# \text{varname} at the start of an evaluation
+_TEXT_VAR_RE = re.compile(r'\$\\text\{([^}]+)\}\s*(==)')
+_NEWLINE_COLLAPSE_RE = re.compile(r'\n{3,}')
+# Unit in \text{unit} (or \\text{unit}) at the end of a result
+_TEXT_UNIT_TAIL_RE = re.compile(r'(?:\\\\)?\\text\{([^}]+)\}\s*$')
+
+# Error/warning markup or metadata footer: the document is the output of
+# an earlier run and is cleared before processing (one scan instead of
+# three substring checks)
+_PROCESSED_MARKUP_RE = re.compile(r'\\color\{(?:red|orange)\}|livemathtex-meta')
+
+# Substrings at least one of which must be present for clear_text() to
+# change anything: evaluations, error/warning markup, orphaned \\
+# continuations, definitions ending in newlines, runs of blank lines,
+# the metadata footer and processed cross-references.
+_CLEAR_NEEDLES = (
+    '==', '\\color{', '(Error:', '\\\\', '\n$', '\n\n\n', 'livemathtex-meta', '<!-- {{',
+)
+
+# Inline unit hint [unit] at the end of a result
+_UNIT_HINT_TAIL_RE = re.compile(r'\[([^\]]+)\]\s*$')
+
+# Remainder of an inline `$x == [unit]$` after the ==: a unit hint only
+_UNIT_HINT_ONLY_RE = re.compile(r'\s*\[[^\]]+\]\s*\$')
+
+# Shared value for symbols without value and unit (ValueWithUnit is frozen)
+_EMPTY_VALUE = ValueWithUnit()
+
+# Patterns used by detect_error_markup()
+_COLOR_RED_RE = re.compile(r'\\color\{red\}')
+_COLOR_ORANGE_RE = re.compile(r'\\color\{orange\}')
+_INLINE_ERR_RE = re.compile(r'\\text\{\(Error:')
+
+
+def _tail_unit(result: str) -> str | None:
+    """
+    Extract the unit from a trailing \\text{unit} in a rendered result.
+
+    LaTeX formatting is removed (e.g., \\text{m³/h} -> m³/h).
+
+    Returns:
+        The unit string, or None if the result does not end in \\text{...}
+    """
+    if '\\text{' not in result:
+        return None
+    match = _TEXT_UNIT_TAIL_RE.search(result)
+    if not match:
+        return None
+    return match.group(1).replace('\\', '').strip()
+
+
+def _find_evaluation(text: str, start: int, stop: int, inline: bool) -> int:
+    """
+    Find the first == in text[start:stop] that _clear_text_regex() clears.
+
+    The operator must not be part of ===, must be followed by at least one
+    character before stop and, for inline math, must not be followed by
+    only an [unit] hint and the closing $.
+
+    Returns:
+        Index of the operator, or -1 if there is none
+    """
+    i = text.find('==', start, stop)
+    while i != -1:
+        if (
+            text[i - 1] != '='
+            and text[i + 2] != '='
+            and i + 2 < stop
+            and not (inline and _UNIT_HINT_ONLY_RE.match(text, i + 2))
+        ):
+            return i
+        i = text.find('==', i + 1, stop)
+    return -1
+
+
+def _sub_evaluations(text: str, delimiter: str, replace) -> str:
+    """
+    Replace `$...== value$` (or `$$...== value$$`) evaluations in one pass.
+
+    Linear equivalent of re.sub() with the legacy backtracking patterns:
+    every $ is tried as an opening delimiter, the math runs to the next $,
+    and scanning resumes after a replaced evaluation.
+
+    Args:
+        text: Document text
+        delimiter: '$' for inline math, '$$' for display math
+        replace: Called with (text before ==, text after ==) of each
+                 evaluation, including both delimiters; returns the
+                 replacement
+
+    Returns:
+        Text with all evaluations replaced
+    """
+    inline = delimiter == '$'
+    width = len(delimiter)
+    parts = []
+    pos = 0
+    start = text.find('$')
+    while start != -1:
+        if inline or text.startswith('$$', start):
+            close = text.find('$', start + width)
+            if close == -1:
+                break
+            op = _find_evaluation(text, start + width, close, inline)
+            if op != -1 and (inline or text.startswith('$$', close)):
+                end = close + width
+                parts.append(text[pos:start])
+                parts.append(replace(text[start:op], text[op + 2:end]))
+                pos = end
+                start = text.find('$', end)
+                continue
+        start = text.find('$', start + 1)
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+# Next brace, for _strip_color_markup()
+_BRACE_RE = re.compile(r'[{}]')
+
+
+def _strip_color_markup(text: str, opener: str = '\\color{red}{') -> str:
+    """
+    Remove `\\color{red}{...}` markup in one pass.
+
+    Linear equivalent of _ERROR_RE.sub('', text): the braced content may
+    nest one level deep; markup that nests deeper or is never closed is
+    left in place. Only the braces are visited, by a C-level search.
+
+    Args:
+        text: Document text
+        opener: Markup prefix up to and including the opening brace
+
+    Returns:
+        Text with all complete markup regions removed
+    """
+    parts = []
+    pos = 0
+    start = text.find(opener)
+    while start != -1:
+        end = -1
+        brace = _BRACE_RE.search(text, start + len(opener))
+        while brace:
+            if brace.group() == '}':
+                end = brace.end()
+                break
+            # One nested level: its first brace must close it
+            inner = _BRACE_RE.search(text, brace.end())
+            if not inner or inner.group() == '{':
+                break
+            brace = _BRACE_RE.search(text, inner.end())
+        if end == -1:
+            start = text.find(opener, start + 1)
+            continue
+        parts.append(text[pos:start])
+        pos = end
+        start = text.find(opener, end)
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _strip_multiline_markup(text: str, color: str = 'red') -> str:
+    """
+    Remove multiline error blocks: newline + \\\\ + \\color{red}{\\text{...}}.
+
+    Linear equivalent of the former non-greedy regex: after the newline,
+    the \\\\ and optional whitespace, a block runs to the first }} after its
+    \\text{. Once no }} is left no later block can match either, so the scan
+    stops instead of retrying from every remaining newline.
+
+    Args:
+        text: Document text
+        color: 'red' for error blocks, 'orange' for warning blocks
+
+    Returns:
+        Text with all multiline blocks removed
+    """
+    markup = '\\color{' + color + '}{\\text{'
+    parts = []
+    pos = 0
+    start = text.find('\n\\\\')
+    while start != -1:
+        body = start + 3
+        while body < len(text) and text[body].isspace():
+            body += 1
+        if text.startswith(markup, body):
+            close = text.find('}}', body + len(markup))
+            if close == -1:
+                break
+            parts.append(text[pos:start])
+            pos = close + 2
+            start = text.find('\n\\\\', pos)
+        else:
+            start = text.find('\n\\\\', start + 1)
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 
 def _clear_text_regex(content: str) -> tuple[str, int]:
@@ -70,14 +300,13 @@ def _clear_text_regex(content: str) -> tuple[str, int]:
     # Restores: inline unit hints from \text{unit} in output
     # Captures: (stuff before ==)
     # Replace with: \1==$ or \1== [unit]$ if unit hint present
-    def clear_inline_eval(match):
+    def clear_inline_eval(prefix, result_part):
         nonlocal count
         count += 1
-        prefix = match.group(1)  # Everything before ==
-        result_part = match.group(0)[len(prefix)+2:]  # Everything after ==
+        # prefix: everything before ==, result_part: everything after ==
 
         # Check if inline unit hint [unit] is already present at end
-        unit_hint_match = re.search(r'\[([^\]]+)\]\s*$', result_part)
+        unit_hint_match = _UNIT_HINT_TAIL_RE.search(result_part)
         if unit_hint_match:
             # Preserve the existing unit hint
             unit = unit_hint_match.group(1)
@@ -86,25 +315,19 @@ def _clear_text_regex(content: str) -> tuple[str, int]:
         # Try to extract unit from \text{unit} in processed output
         # Pattern: \text{unit} at end of result (handle escaped backslashes)
         # Match both \\text{unit} (escaped) and \text{unit} (single)
-        text_unit_match = re.search(r'(?:\\\\)?\\text\{([^}]+)\}\s*$', result_part)
-        if text_unit_match:
-            # Extract unit from \text{unit} and restore as inline hint
-            unit = text_unit_match.group(1)
-            # Clean up LaTeX formatting (e.g., \text{m³/h} -> m³/h)
-            # Remove LaTeX commands but keep the unit string
-            unit_clean = unit.replace('\\', '').strip()
-            return f'{prefix}== [{unit_clean}]$'
+        unit = _tail_unit(result_part)
+        if unit is not None:
+            # Restore as inline hint
+            return f'{prefix}== [{unit}]$'
 
         # No unit hint found, just clear
         return f'{prefix}==$'
 
-    # Pattern for inline: $...== value$ (not ===)
-    # Use negative lookbehind AND negative lookahead to avoid ===
-    # Exclude: $...== [unit]$ (unit hints only, no evaluation to clear)
-    # Capture group does NOT include the ==
-    # Match: == followed by something that's NOT just [unit]
-    inline_pattern = r'(\$[^\$]*?)(?<!=)==(?!=)(?!\s*\[[^\]]+\]\s*\$)\s*[^\$]+\$'
-    cleared = re.sub(inline_pattern, clear_inline_eval, cleared)
+    # Inline: $...== value$ (not ===)
+    # Excludes $...== [unit]$ (unit hints only, no evaluation to clear)
+    # Found with a linear scan (see _sub_evaluations) rather than the
+    # backtracking regex (\$[^\$]*?)(?<!=)==(?!=)(?!\s*\[[^\]]+\]\s*\$)\s*[^\$]+\$
+    cleared = _sub_evaluations(cleared, '$', clear_inline_eval)
 
     # Special case: preserve inline unit hints $...== [unit]$
     # These are not evaluations, just unit hints, so don't clear them
@@ -112,63 +335,56 @@ def _clear_text_regex(content: str) -> tuple[str, int]:
 
     # Pattern 2: Clear evaluation results in display math `$$...$$`
     # Capture group does NOT include the ==
-    def clear_display_eval(match):
+    def clear_display_eval(prefix, result_part):
         nonlocal count
         count += 1
-        prefix = match.group(1)
         return f'{prefix}==$$'
 
-    display_pattern = r'(\$\$[^\$]*?)(?<!=)==(?!=)\s*[^\$]+\$\$'
-    cleared = re.sub(display_pattern, clear_display_eval, cleared)
+    # Same scan as for inline math: (\$\$[^\$]*?)(?<!=)==(?!=)\s*[^\$]+\$\$
+    cleared = _sub_evaluations(cleared, '$$', clear_display_eval)
 
     # Pattern 3: Remove error markup (red color) with nested braces
     # \color{red}{...} - LaTeX color commands with braced content
-    # Uses pattern that handles one level of nesting: \{(?:[^{}]|\{[^{}]*\})*\}
-    # This properly matches \color{red}{\text{...}} without stopping at inner }
-    error_pattern = r'\\color\{red\}\{(?:[^{}]|\{[^{}]*\})*\}'
-    cleared = re.sub(error_pattern, '', cleared)
+    # Handles one level of nesting, like \{(?:[^{}]|\{[^{}]*\})*\}, so
+    # \color{red}{\text{...}} does not stop at the inner }; scanned by
+    # brace instead of with the regex
+    cleared = _strip_color_markup(cleared)
 
     # Pattern 4: Remove inline error text
     # \text{(Error: ...)}
-    error_text_pattern = r'\\text\{\(Error:[^)]*\)\}'
-    cleared = re.sub(error_text_pattern, '', cleared)
+    cleared = _ERROR_TEXT_RE.sub('', cleared)
 
     # Pattern 5: Remove multiline error blocks entirely
     # Matches: newline + \\ + \color{red}{\text{...}} spanning multiple lines
-    # The [\s\S]*? matches any character including newlines (non-greedy)
-    multiline_error = r'\n\\\\\s*\\color\{red\}\{\\text\{[\s\S]*?\}\}'
-    cleared = re.sub(multiline_error, '', cleared)
+    # Ends at the first }} after \text{, like the non-greedy [\s\S]*?
+    cleared = _strip_multiline_markup(cleared)
 
     # Pattern 6: Remove orphaned line continuation artifacts
     # After error removal, we may have:
     # - \\ }$ (incomplete closing brace)
     # - \\ $ (just line continuation before closing)
     # Replace with just $ to close the math block properly
-    orphan_brace = r'\n?\\\\\s*\}\$'
-    cleared = re.sub(orphan_brace, '$', cleared)
-    orphan_newline = r'\n\\\\\s*\$'
-    cleared = re.sub(orphan_newline, '$', cleared)
+    cleared = _ORPHAN_BRACE_RE.sub('$', cleared)
+    cleared = _ORPHAN_NL_RE.sub('$', cleared)
 
     # Pattern 7: Fix definitions that end with newline (error was removed)
     # Matches: $expr := value\n$ or $expr := value\n\n$
     # Convert to: $expr := value$
-    incomplete_def = r'(\$[^$]+:=\s*[^\n$]+)\n+\$'
-    cleared = re.sub(incomplete_def, r'\1$', cleared)
+    cleared = _INCOMPLETE_DEF_RE.sub(r'\1$', cleared)
 
     # Pattern 8: Convert \text{varname} back to varname in evaluations
     # The evaluator wraps variable names in \text{} for display, but the parser
     # needs the original syntax. Only convert at start of math: $\text{name}
     # This allows re-processing of cleared files.
-    text_var_pattern = r'\$\\text\{([^}]+)\}\s*(==)'
-    cleared = re.sub(text_var_pattern, r'$\1 \2', cleared)
+    if '$\\text{' in cleared:
+        cleared = _TEXT_VAR_RE.sub(r'$\1 \2', cleared)
 
     # Pattern 9: Remove livemathtex metadata comment
     # > *livemathtex: timestamp | stats | errors | duration* <!-- livemathtex-meta -->
-    meta_pattern = r'\n+---\n+>\s*\*livemathtex:[^*]+\*\s*<!--\s*livemathtex-meta\s*-->\n*'
-    cleared = re.sub(meta_pattern, '\n', cleared)
+    cleared = META_FOOTER_RE.sub('\n', cleared)
 
     # Clean up any double newlines left by removals
-    cleared = re.sub(r'\n{3,}', '\n\n', cleared)
+    cleared = _NEWLINE_COLLAPSE_RE.sub('\n\n', cleared)
 
     return cleared, count
 
@@ -202,21 +418,21 @@ def detect_error_markup(content: str) -> dict:
     }
 
     # Check for error color markup
-    error_matches = re.findall(r'\\color\{red\}', content)
+    error_matches = _COLOR_RED_RE.findall(content)
     if error_matches:
         result['has_errors'] = True
         result['count'] = len(error_matches)
         result['patterns'].append('color{red}')
 
     # ISS-017: Check for warning color markup
-    warning_matches = re.findall(r'\\color\{orange\}', content)
+    warning_matches = _COLOR_ORANGE_RE.findall(content)
     if warning_matches:
         result['has_warnings'] = True
         result['warning_count'] = len(warning_matches)
         result['patterns'].append('color{orange}')
 
     # Check for inline error text
-    inline_errors = re.findall(r'\\text\{\(Error:', content)
+    inline_errors = _INLINE_ERR_RE.findall(content)
     if inline_errors:
         result['has_errors'] = True
         result['count'] += len(inline_errors)
@@ -230,6 +446,25 @@ def detect_error_markup(content: str) -> dict:
     return result
 
 
+def _apply_edits(text: str, edits: list[tuple[int, int, str]]) -> str:
+    """
+    Replace (start, end, replacement) spans of text, joining once.
+
+    Edits are applied in document order; an edit starting inside a span
+    already replaced is skipped, so overlapping spans never repeat text.
+    """
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        if start < pos:
+            continue
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
 def clear_text(content: str) -> tuple[str, int]:
     """
     Clear computed values from a processed livemathtex document.
@@ -252,130 +487,65 @@ def clear_text(content: str) -> tuple[str, int]:
     from .parser.calculation_parser import parse_math_block_calculations
     from .parser.markdown_parser import extract_math_blocks
 
-    # Track edits to apply (start, end, replacement)
-    edits: list[tuple[int, int, str]] = []
-    count = 0
-
-    # 1. Parse document to find all math blocks
-    try:
-        blocks = extract_math_blocks(content)
-    except Exception:
-        # If parsing fails, fall back to empty (no math blocks found)
-        blocks = []
-
-    # 2. For each block, identify spans to clear
-    for block in blocks:
-        try:
-            calcs = parse_math_block_calculations(block)
-        except Exception:
-            continue
-
-        for calc in calcs:
-            # For == evaluations, clear the result
-            if calc.operation == "==" and calc.result_span:
-                count += 1
-                # Check if there's a unit hint to preserve
-                unit_replacement = ""
-                if calc.unit_hint and calc.unit_hint_span:
-                    # Preserve the unit hint as [unit] format
-                    unit_replacement = f" [{calc.unit_hint}]"
-                elif calc.result:
-                    # Try to extract unit from \text{unit} in result
-                    text_unit_match = re.search(
-                        r'(?:\\\\)?\\text\{([^}]+)\}\s*$', calc.result
-                    )
-                    if text_unit_match:
-                        unit = text_unit_match.group(1).replace('\\', '').strip()
-                        unit_replacement = f" [{unit}]"
-
-                # Replace result with empty (or unit hint)
-                edits.append((
-                    calc.result_span.start,
-                    calc.result_span.end,
-                    unit_replacement
-                ))
+    # 0. Fast path: nothing any of the steps below would touch
+    if not any(needle in content for needle in _CLEAR_NEEDLES):
+        return content, 0
 
-            # For :=_== combined, clear only the result part after ==
-            elif calc.operation == ":=_==" and calc.result_span:
-                # Skip if result is already empty (nothing to clear)
-                if not calc.result or not calc.result.strip():
-                    continue
-                count += 1
-                unit_replacement = ""
-                if calc.unit_hint and calc.unit_hint_span:
-                    unit_replacement = f" [{calc.unit_hint}]"
-                elif calc.result:
-                    text_unit_match = re.search(
-                        r'(?:\\\\)?\\text\{([^}]+)\}\s*$', calc.result
-                    )
-                    if text_unit_match:
-                        unit = text_unit_match.group(1).replace('\\', '').strip()
-                        unit_replacement = f" [{unit}]"
-
-                edits.append((
-                    calc.result_span.start,
-                    calc.result_span.end,
-                    unit_replacement
-                ))
-
-            # For ERROR, we need to handle error markup specially
-            # The calculation itself might have error markup inserted
-            # We'll handle this with regex below since error markup
-            # is inserted by the renderer, not part of the parsed structure
-
-    # 3. Remove error/warning markup with regex (safe - doesn't affect structure)
+    # 1. Remove error/warning markup with regex (safe - doesn't affect structure)
     # This handles \color{red}{...} and \color{orange}{...} which is rendering output
-    # We do this BEFORE applying span edits since error/warning markup may be
-    # outside the parsed calculation spans
+    # We do this BEFORE parsing, since error/warning markup may be outside
+    # the parsed calculation spans and its removal shifts offsets
     cleared = content
 
-    # Error patterns (same as original, safe for error markup removal)
-    # Pattern: \color{red}{...} with nested braces
-    error_pattern = r'\\color\{red\}\{(?:[^{}]|\{[^{}]*\})*\}'
-    cleared = re.sub(error_pattern, '', cleared)
+    # Each substitution below is guarded by a substring its pattern
+    # requires, so passes that cannot match skip the regex scan
+
+    # Error patterns: \color{red}{...} with nested braces
+    if '\\color{red}' in cleared:
+        cleared = _ERROR_RE.sub('', cleared)
 
     # ISS-017: Warning patterns - \color{orange}{...} with nested braces
-    warning_pattern = r'\\color\{orange\}\{(?:[^{}]|\{[^{}]*\})*\}'
-    cleared = re.sub(warning_pattern, '', cleared)
+    if '\\color{orange}' in cleared:
+        cleared = _WARNING_RE.sub('', cleared)
 
     # Inline error text: \text{(Error: ...)}
-    error_text_pattern = r'\\text\{\(Error:[^)]*\)\}'
-    cleared = re.sub(error_text_pattern, '', cleared)
+    if '(Error:' in cleared:
+        cleared = _ERROR_TEXT_RE.sub('', cleared)
 
     # Multiline error blocks: newline + \\ + \color{red}{\text{...}}
-    multiline_error = r'\n\\\\\s*\\color\{red\}\{\\text\{[\s\S]*?\}\}'
-    cleared = re.sub(multiline_error, '', cleared)
+    if '\\color{red}' in cleared:
+        cleared = _strip_multiline_markup(cleared)
 
     # ISS-017: Multiline warning blocks: newline + \\ + \color{orange}{\text{...}}
-    multiline_warning = r'\n\\\\\s*\\color\{orange\}\{\\text\{[\s\S]*?\}\}'
-    cleared = re.sub(multiline_warning, '', cleared)
+    if '\\color{orange}' in cleared:
+        cleared = _strip_multiline_markup(cleared, 'orange')
 
     # Clean up orphan artifacts (from old implementation patterns 6-7)
     # Remove orphan line continuation before closing $
-    orphan_brace = r'\n?\\\\\s*\}\$'
-    cleared = re.sub(orphan_brace, '$', cleared)
-    orphan_newline = r'\n\\\\\s*\$'
-    cleared = re.sub(orphan_newline, '$', cleared)
+    if '\\\\' in cleared:
+        cleared = _ORPHAN_BRACE_RE.sub('$', cleared)
+        cleared = _ORPHAN_NL_RE.sub('$', cleared)
 
     # Fix incomplete definitions with trailing newlines
-    incomplete_def = r'(\$[^$]+:=\s*[^\n$]+)\n+\$'
-    cleared = re.sub(incomplete_def, r'\1$', cleared)
+    if '\n$' in cleared:
+        cleared = _INCOMPLETE_DEF_RE.sub(r'\1$', cleared)
 
     # Remove trailing whitespace after == before $ (after error removal)
     # This handles cases like `$bad == $` → `$bad ==$`
     # But preserves `$x == [kJ]$` (unit hints)
-    trailing_ws_after_eval = r'(==)\s+\$'
-    cleared = re.sub(trailing_ws_after_eval, r'\1$', cleared)
+    if '==' in cleared:
+        cleared = _TRAILING_WS_EVAL_RE.sub(r'\1$', cleared)
 
-    # 4. Re-parse after error removal to get accurate spans
-    # (Error removal may have changed offsets)
+    # 2. Parse the cleaned document once to find the spans to clear
+    # (only evaluations are cleared, so skip parsing without any ==)
     try:
-        blocks = extract_math_blocks(cleared)
+        blocks = extract_math_blocks(cleared) if '==' in cleared else []
     except Exception:
+        # If parsing fails, fall back to empty (no math blocks found)
         blocks = []
 
-    # Rebuild edits list with fresh spans
-    edits = []
+    # Track edits to apply (start, end, replacement)
+    edits: list[tuple[int, int, str]] = []
     count = 0
 
     for block in blocks:
@@ -394,11 +564,8 @@ def clear_text(content: str) -> tuple[str, int]:
                 if calc.unit_hint and calc.unit_hint_span:
                     unit_replacement = f" [{calc.unit_hint}]"
                 elif calc.result:
-                    text_unit_match = re.search(
-                        r'(?:\\\\)?\\text\{([^}]+)\}\s*$', calc.result
-                    )
-                    if text_unit_match:
-                        unit = text_unit_match.group(1).replace('\\', '').strip()
+                    unit = _tail_unit(calc.result)
+                    if unit is not None:
                         unit_replacement = f" [{unit}]"
 
                 # Extend span start to operator end to capture whitespace
@@ -420,11 +587,8 @@ def clear_text(content: str) -> tuple[str, int]:
                 if calc.unit_hint and calc.unit_hint_span:
                     unit_replacement = f" [{calc.unit_hint}]"
                 elif calc.result:
-                    text_unit_match = re.search(
-                        r'(?:\\\\)?\\text\{([^}]+)\}\s*$', calc.result
-                    )
-                    if text_unit_match:
-                        unit = text_unit_match.group(1).replace('\\', '').strip()
+                    unit = _tail_unit(calc.result)
+                    if unit is not None:
                         unit_replacement = f" [{unit}]"
 
                 # For :=_==, there's a secondary == operator
@@ -443,38 +607,38 @@ def clear_text(content: str) -> tuple[str, int]:
 
                 edits.append((edit_start, edit_end, unit_replacement))
 
-    # 5. Apply edits in reverse order (end to start) to preserve offsets
-    edits.sort(key=lambda x: x[0], reverse=True)
-
-    for start, end, replacement in edits:
-        cleared = cleared[:start] + replacement + cleared[end:]
+    # 3. Apply edits in document order
+    if edits:
+        cleared = _apply_edits(cleared, edits)
 
-    # 6. Clean up orphan artifacts that may remain
+    # 4. Clean up orphan artifacts that may remain
     # After clearing, we might have:
     # - Empty \\ before $ (line continuation without content)
     # - Trailing whitespace before $
-    orphan_newline = r'\n\\\\\s*\$'
-    cleared = re.sub(orphan_newline, '$', cleared)
-    orphan_brace = r'\n?\\\\\s*\}\$'
-    cleared = re.sub(orphan_brace, '$', cleared)
+    if '\\\\' in cleared:
+        cleared = _ORPHAN_NL_RE.sub('$', cleared)
+        cleared = _ORPHAN_BRACE_RE.sub('$', cleared)
 
     # Fix definitions that end with newline (error was removed)
-    incomplete_def = r'(\$[^$]+:=\s*[^\n$]+)\n+\$'
-    cleared = re.sub(incomplete_def, r'\1$', cleared)
+    if '\n$' in cleared:
+        cleared = _INCOMPLETE_DEF_RE.sub(r'\1$', cleared)
 
     # Convert \text{varname} back to varname for evaluations
-    text_var_pattern = r'\$\\text\{([^}]+)\}\s*(==)'
-    cleared = re.sub(text_var_pattern, r'$\1 \2', cleared)
+    if '$\\text{' in cleared:
+        cleared = _TEXT_VAR_RE.sub(r'$\1 \2', cleared)
 
-    # 7. Remove livemathtex metadata comment
-    meta_pattern = r'\n+---\n+>\s*\*livemathtex:[^*]+\*\s*<!--\s*livemathtex-meta\s*-->\n*'
-    cleared = re.sub(meta_pattern, '\n', cleared)
+    # 5. Remove livemathtex metadata comment
+    if 'livemathtex-meta' in cleared:
+        cleared = META_FOOTER_RE.sub('\n', cleared)
 
-    # 8. Clean up excessive newlines
-    cleared = re.sub(r'\n{3,}', '\n\n', cleared)
+    # 6. Clean up excessive newlines
+    if '\n\n\n' in cleared:
+        cleared = _NEWLINE_COLLAPSE_RE.sub('\n\n', cleared)
 
-    # 9. Restore cross-references: value<!-- {{ref}} --> → {{ref}}
-    cleared, ref_count = restore_references(cleared)
+    # 7. Restore cross-references: value<!-- {{ref}} --> → {{ref}}
+    ref_count = 0
+    if '<!-- {{' in cleared:
+        cleared, ref_count = restore_references(cleared)
 
     return cleared, count + ref_count
 
@@ -634,8 +798,7 @@ def evaluate_cross_references(
     """
     from .engine.expression_evaluator import EvaluationError, evaluate_expression_tree
     from .engine.pint_backend import clean_latex_unit, get_unit_registry
-    from .parser.expression_parser import ExpressionParser, ParseError
-    from .parser.expression_tokenizer import ExpressionTokenizer
+    from .parser.expression_parser import ParseError, parse_expression
 
     refs = extract_references(content)
     if not refs:
@@ -650,9 +813,8 @@ def evaluate_cross_references(
     symbols_dict = {}
     symbol_units = {}  # Store original unit for ISS-051
 
-    for name in evaluator.symbols.all_names():
-        entry = evaluator.symbols.get(name)
-        if entry and entry.si_value is not None:
+    for name, entry in evaluator.symbols.items():
+        if entry.si_value is not None:
             latex_name = entry.latex_name or name
             try:
                 # Create Pint Quantity from stored value
@@ -697,10 +859,7 @@ def evaluate_cross_references(
                     break
 
             # Parse and evaluate the expression
-            tokenizer = ExpressionTokenizer(ref_content)
-            tokens = tokenizer.tokenize()
-            parser = ExpressionParser(tokens)
-            tree = parser.parse()
+            tree = parse_expression(ref_content)
 
             result = evaluate_expression_tree(tree, symbols_dict, ureg)
 
@@ -786,11 +945,85 @@ def evaluate_cross_references(
     return result, evaluated, errored
 
 
+def _evaluate_document(
+    document: Document,
+    evaluator: Evaluator,
+    ir: LivemathIR | None = None,
+) -> tuple[list, int, Counter]:
+    """
+    Evaluate every calculation of a document in order.
+
+    Args:
+        document: Parsed document
+        evaluator: Evaluator holding the symbol table for this run
+        ir: IR to record evaluation errors in (process_file). With an IR,
+            the block's source line is passed to the evaluator and each
+            result is the block's LaTeX; without one, each result is a
+            (LaTeX, inline unit hint) tuple for the renderer (ISS-013).
+
+    Returns:
+        Tuple of (results, error count, calculations per operation type).
+        results has one entry per document.math_blocks item, None for
+        blocks without calculations.
+    """
+    lexer = _LEXER
+    math_blocks = document.math_blocks
+    results = [None] * len(math_blocks)
+
+    error_count = 0
+    op_counts = Counter()  # calculations per operation type
+
+    for index, block in enumerate(math_blocks):
+        calculations = lexer.extract_calculations(block)
+        block_calcs_results = [None] * len(calculations)
+
+        if not calculations:
+            continue
+
+        # Extract expression-level config overrides from block comment
+        expr_overrides = lexer.extract_config_from_comment(block)
+        block_line = block.start_line if ir is not None else 0
+
+        # Count by operation type
+        op_counts.update(calc.operation for calc in calculations)
+
+        for i, calc in enumerate(calculations):
+            try:
+                result_latex = evaluator.evaluate(calc, config_overrides=expr_overrides, line=block_line)
+                if evaluator.last_error:
+                    error_count += 1
+                    if ir is not None:
+                        ir.add_error(block_line, f"Evaluation error in: {calc.latex[:50]}...")
+                block_calcs_results[i] = result_latex
+            except Exception as e:
+                error_count += 1
+                if ir is not None:
+                    ir.add_error(block_line, str(e))
+                block_calcs_results[i] = f"{calc.latex} \\quad \\text{{(Error: {e})}}"
+
+        if ir is not None:
+            results[index] = "\n".join(block_calcs_results)
+            continue
+
+        # ISS-013: Store result with optional inline unit hint for renderer
+        # If a calculation has unit_comment but the block doesn't, propagate it
+        inline_unit_hint = None
+        if not block.unit_comment:
+            for calc in calculations:
+                if calc.unit_comment:
+                    inline_unit_hint = calc.unit_comment
+                    break  # Use first found
+        results[index] = ("\n".join(block_calcs_results), inline_unit_hint)
+
+    return results, error_count, op_counts
+
+
 def process_file(
     input_path: str,
     output_path: str = None,
     verbose: bool = False,
     ir_output_path: str = None,
+    content: str | None = None,
 ) -> LivemathIR:
     """
     Main pipeline: Read -> Parse -> Build IR -> Evaluate -> Render -> Write
@@ -808,6 +1041,8 @@ def process_file(
         output_path: Path to output markdown file (CLI -o override)
         verbose: If True, write IR to JSON file for debugging
         ir_output_path: Custom path for IR JSON (default: input_path.lmt.json)
+        content: Document text if the caller has already read input_path
+                 (skips the second read)
 
     Returns:
         The processed LivemathIR containing all symbol values and results
@@ -815,21 +1050,21 @@ def process_file(
     start_time = time.time()
     input_path_obj = Path(input_path)
 
-    # 1. Read document
-    with open(input_path, encoding='utf-8') as f:
-        content = f.read()
+    # 1. Read document (unless the caller already has it in memory)
+    if content is None:
+        content = read_document(input_path_obj)
 
     # 1a. Pre-process: If content appears to be already processed
     # (contains error markup or livemathtex-meta), clear it first.
     # This ensures idempotent processing of output files.
-    if '\\color{red}' in content or '\\color{orange}' in content or 'livemathtex-meta' in content:
+    if _PROCESSED_MARKUP_RE.search(content):
         content, _ = clear_text(content)
 
     # 2. Load config from files (levels 3-6 of hierarchy)
     base_config = LivemathConfig.load(input_path_obj)
 
     # 3. Parse document directives (level 2 of hierarchy)
-    lexer = Lexer()
+    lexer = _LEXER
     doc_directives = lexer.parse_document_directives(content)
     config = base_config.with_overrides(doc_directives)
 
@@ -840,74 +1075,35 @@ def process_file(
     document = lexer.parse(content)
 
     # 6. Build IR (extracts custom units)
-    builder = IRBuilder()
+    builder = _IR_BUILDER
     ir = builder.build(document, source=str(input_path))
 
     # 7. Evaluate all calculations
     evaluator = Evaluator(config=config)
-    results = {}  # Map MathBlock -> Resulting LaTeX string
-
-    error_count = 0
-    assign_count = 0
-    eval_count = 0
-    symbolic_count = 0
-    value_count = 0
-
-    for block in document.children:
-        if isinstance(block, MathBlock):
-            calculations = lexer.extract_calculations(block)
-            block_calcs_results = []
-
-            if not calculations:
-                continue
-
-            # Extract expression-level config overrides from block comment
-            expr_overrides = lexer.extract_config_from_comment(block)
-
-            for calc in calculations:
-                # Count by operation type
-                if calc.operation == ':=':
-                    assign_count += 1
-                elif calc.operation == '==':
-                    eval_count += 1
-                elif calc.operation == ':=_==':
-                    assign_count += 1
-                    eval_count += 1
-                elif calc.operation == '=>':
-                    symbolic_count += 1
-                elif calc.operation == 'value':
-                    value_count += 1
-
-                try:
-                    block_line = block.location.start_line if block.location else 0
-                    result_latex = evaluator.evaluate(calc, config_overrides=expr_overrides, line=block_line)
-                    if '\\color{red}' in result_latex:
-                        error_count += 1
-                        # Add to IR errors
-                        line = block_line
-                        ir.add_error(line, f"Evaluation error in: {calc.latex[:50]}...")
-                    block_calcs_results.append(result_latex)
-                except Exception as e:
-                    error_count += 1
-                    line = block.location.start_line if block.location else 0
-                    ir.add_error(line, str(e))
-                    block_calcs_results.append(f"{calc.latex} \\quad \\text{{(Error: {e})}}")
-
-            results[block] = "\n".join(block_calcs_results)
+    results, error_count, op_counts = _evaluate_document(document, evaluator, ir=ir)
 
     duration = time.time() - start_time
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Run info shared by the IR stats and the rendered metadata
+    run_info = {
+        "last_run": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration": f"{duration:.2f}s",
+    }
 
     # ISS-017: Get warning count from evaluator
     warning_count = evaluator.get_warning_count()
 
+    # Combined :=_== counts as both a definition and an evaluation
+    assign_count = op_counts[':='] + op_counts[':=_==']
+    eval_count = op_counts['=='] + op_counts[':=_==']
+    symbolic_count = op_counts['=>']
+    value_count = op_counts['value']
+
     # 8. Update IR with symbol values from evaluator
     _populate_ir_symbols(ir, evaluator)
 
     # Update IR stats
     ir.stats = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "symbols": len(ir.symbols),
         "definitions": assign_count,
         "evaluations": eval_count,
@@ -919,8 +1115,7 @@ def process_file(
 
     # 9. Render
     metadata = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "assigns": assign_count,
         "evals": eval_count,
         "symbolics": symbolic_count,
@@ -929,7 +1124,7 @@ def process_file(
         "warnings": warning_count,  # ISS-017
     }
 
-    renderer = MarkdownRenderer()
+    renderer = _RENDERER
     new_doc_content = renderer.render(document, results, metadata=metadata)
 
     # 9a. ISS-040: Evaluate cross-references {{variable}} in prose text
@@ -943,8 +1138,7 @@ def process_file(
         ir.stats["cross_ref_errors"] = refs_errored
 
     # 10. Write output markdown
-    with open(resolved_output, 'w') as f:
-        f.write(new_doc_content)
+    write_document(resolved_output, new_doc_content)
 
     # 11. Optionally write IR JSON for debugging
     if verbose:
@@ -968,19 +1162,18 @@ def _populate_ir_symbols(ir: LivemathIR, evaluator: Evaluator) -> None:
     - valid: Conversion validation flag
     - line: Line number (if available)
     """
-    for name in evaluator.symbols.all_names():
-        entry = evaluator.symbols.get(name)
-        if not entry:
-            continue
-
+    for name, entry in evaluator.symbols.items():
         # Use the LaTeX name as the key (user's original notation)
         symbol_key = entry.latex_name if entry.latex_name else name
 
         # Create original value struct
-        original = ValueWithUnit(
-            value=entry.original_value,
-            unit=entry.original_unit
-        )
+        if entry.original_value is None and entry.original_unit is None:
+            original = _EMPTY_VALUE
+        else:
+            original = ValueWithUnit(
+                value=entry.original_value,
+                unit=entry.original_unit
+            )
 
         # Create SI value struct - values are already floats/strings from Pint evaluator
         si_value = None
@@ -1001,10 +1194,13 @@ def _populate_ir_symbols(ir: LivemathIR, evaluator: Evaluator) -> None:
         except Exception:
             pass
 
-        si = ValueWithUnit(
-            value=si_value,
-            unit=si_unit_str
-        )
+        if si_value is None and si_unit_str is None:
+            si = _EMPTY_VALUE
+        else:
+            si = ValueWithUnit(
+                value=si_value,
+                unit=si_unit_str
+            )
 
         # Create symbol entry
         ir.set_symbol(symbol_key, SymbolEntry(
@@ -1035,11 +1231,11 @@ def process_text(
     # Pre-process: If content appears to be already processed
     # (contains error markup or livemathtex-meta), clear it first.
     # This ensures idempotent processing of output files.
-    if '\\color{red}' in content or '\\color{orange}' in content or 'livemathtex-meta' in content:
+    if _PROCESSED_MARKUP_RE.search(content):
         content, _ = clear_text(content)
 
     # 1. Parse document structure
-    lexer = Lexer()
+    lexer = _LEXER
     document = lexer.parse(content)
 
     # 2. Parse document directives and create config
@@ -1047,74 +1243,34 @@ def process_text(
     config = LivemathConfig().with_overrides(doc_directives) if doc_directives else LivemathConfig()
 
     # 3. Build IR
-    builder = IRBuilder()
+    builder = _IR_BUILDER
     ir = builder.build(document, source=source)
 
     # 4. Evaluate
     evaluator = Evaluator(config=config)
-    results = {}
-
-    error_count = 0
-    assign_count = 0
-    eval_count = 0
-    symbolic_count = 0
-    value_count = 0
-
-    for block in document.children:
-        if isinstance(block, MathBlock):
-            calculations = lexer.extract_calculations(block)
-            block_calcs_results = []
-
-            if not calculations:
-                continue
-
-            expr_overrides = lexer.extract_config_from_comment(block)
-
-            # ISS-013: Track inline unit hint from calculations for renderer
-            # If a calculation has unit_comment but the block doesn't, propagate it
-            inline_unit_hint = None
-            for calc in calculations:
-                if calc.unit_comment and not block.unit_comment:
-                    inline_unit_hint = calc.unit_comment
-                    break  # Use first found
-
-            for calc in calculations:
-                if calc.operation == ':=':
-                    assign_count += 1
-                elif calc.operation == '==':
-                    eval_count += 1
-                elif calc.operation == ':=_==':
-                    assign_count += 1
-                    eval_count += 1
-                elif calc.operation == '=>':
-                    symbolic_count += 1
-                elif calc.operation == 'value':
-                    value_count += 1
-
-                try:
-                    result_latex = evaluator.evaluate(calc, config_overrides=expr_overrides)
-                    if '\\color{red}' in result_latex:
-                        error_count += 1
-                    block_calcs_results.append(result_latex)
-                except Exception as e:
-                    error_count += 1
-                    block_calcs_results.append(f"{calc.latex} \\quad \\text{{(Error: {e})}}")
-
-            # ISS-013: Store result with optional inline unit hint for renderer
-            results[block] = ("\n".join(block_calcs_results), inline_unit_hint)
+    results, error_count, op_counts = _evaluate_document(document, evaluator)
 
     duration = time.time() - start_time
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Run info shared by the IR stats and the rendered metadata
+    run_info = {
+        "last_run": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration": f"{duration:.2f}s",
+    }
 
     # ISS-017: Get warning count from evaluator
     warning_count = evaluator.get_warning_count()
 
+    # Combined :=_== counts as both a definition and an evaluation
+    assign_count = op_counts[':='] + op_counts[':=_==']
+    eval_count = op_counts['=='] + op_counts[':=_==']
+    symbolic_count = op_counts['=>']
+    value_count = op_counts['value']
+
     # Populate IR symbols
     _populate_ir_symbols(ir, evaluator)
 
     ir.stats = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "symbols": len(ir.symbols),
         "definitions": assign_count,
         "evaluations": eval_count,
@@ -1126,8 +1282,7 @@ def process_text(
 
     # Render
     metadata = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "assigns": assign_count,
         "evals": eval_count,
         "symbolics": symbolic_count,
@@ -1136,7 +1291,7 @@ def process_text(
         "warnings": warning_count,  # ISS-017
     }
 
-    renderer = MarkdownRenderer()
+    renderer = _RENDERER
     new_doc_content = renderer.render(document, results, metadata=metadata)
 
     # ISS-040: Evaluate cross-references {{variable}} in prose text
@@ -1178,7 +1333,7 @@ def process_text_v3(
     start_time = time.time()
 
     # 1. Parse document structure
-    lexer = Lexer()
+    lexer = _LEXER
     document = lexer.parse(content)
 
     # 2. Build config (caller may provide a fully-resolved config, e.g. from file hierarchy)
@@ -1187,75 +1342,35 @@ def process_text_v3(
         config = LivemathConfig().with_overrides(doc_directives) if doc_directives else LivemathConfig()
 
     # 3. Build IR v3.0 (extracts custom units with full metadata)
-    builder = IRBuilder()
+    builder = _IR_BUILDER
     ir = builder.build_v3(document, source=source)
 
     # 4. Evaluate with v3.0 mode
     # Note: For now we still use the existing evaluator but collect v3.0 data
     evaluator = Evaluator(config=config)
-    results = {}
-
-    error_count = 0
-    assign_count = 0
-    eval_count = 0
-    symbolic_count = 0
-    value_count = 0
-
-    for block in document.children:
-        if isinstance(block, MathBlock):
-            calculations = lexer.extract_calculations(block)
-            block_calcs_results = []
-
-            if not calculations:
-                continue
-
-            expr_overrides = lexer.extract_config_from_comment(block)
-
-            # ISS-013: Track inline unit hint from calculations for renderer
-            # If a calculation has unit_comment but the block doesn't, propagate it
-            inline_unit_hint = None
-            for calc in calculations:
-                if calc.unit_comment and not block.unit_comment:
-                    inline_unit_hint = calc.unit_comment
-                    break  # Use first found
-
-            for calc in calculations:
-                if calc.operation == ':=':
-                    assign_count += 1
-                elif calc.operation == '==':
-                    eval_count += 1
-                elif calc.operation == ':=_==':
-                    assign_count += 1
-                    eval_count += 1
-                elif calc.operation == '=>':
-                    symbolic_count += 1
-                elif calc.operation == 'value':
-                    value_count += 1
-
-                try:
-                    result_latex = evaluator.evaluate(calc, config_overrides=expr_overrides)
-                    if '\\color{red}' in result_latex:
-                        error_count += 1
-                    block_calcs_results.append(result_latex)
-                except Exception as e:
-                    error_count += 1
-                    block_calcs_results.append(f"{calc.latex} \\quad \\text{{(Error: {e})}}")
-
-            # ISS-013: Store result with optional inline unit hint for renderer
-            results[block] = ("\n".join(block_calcs_results), inline_unit_hint)
+    results, error_count, op_counts = _evaluate_document(document, evaluator)
 
     duration = time.time() - start_time
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Run info shared by the IR stats and the rendered metadata
+    run_info = {
+        "last_run": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration": f"{duration:.2f}s",
+    }
 
     # ISS-017: Get warning count from evaluator
     warning_count = evaluator.get_warning_count()
 
+    # Combined :=_== counts as both a definition and an evaluation
+    assign_count = op_counts[':='] + op_counts[':=_==']
+    eval_count = op_counts['=='] + op_counts[':=_==']
+    symbolic_count = op_counts['=>']
+    value_count = op_counts['value']
+
     # 5. Populate IR v3.0 symbols
     _populate_ir_symbols_v3(ir, evaluator)
 
     ir.stats = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "symbols": len(ir.symbols),
         "custom_units": len(ir.custom_units),
         "definitions": assign_count,
@@ -1268,8 +1383,7 @@ def process_text_v3(
 
     # 6. Render
     metadata = {
-        "last_run": now_str,
-        "duration": f"{duration:.2f}s",
+        **run_info,
         "assigns": assign_count,
         "evals": eval_count,
         "symbolics": symbolic_count,
@@ -1278,7 +1392,7 @@ def process_text_v3(
         "warnings": warning_count,  # ISS-017
     }
 
-    renderer = MarkdownRenderer()
+    renderer = _RENDERER
     new_doc_content = renderer.render(document, results, metadata=metadata)
 
     return new_doc_content, ir
@@ -1298,11 +1412,7 @@ def _populate_ir_symbols_v3(ir: LivemathIRV3, evaluator: Evaluator) -> None:
     """
     from .engine.pint_backend import convert_to_base_units
 
-    for name in evaluator.symbols.all_names():
-        entry = evaluator.symbols.get(name)
-        if not entry:
-            continue
-
+    for name, entry in evaluator.symbols.items():
         # Get or generate clean ID
         internal_id = entry.internal_id or ""
 
@@ -1310,10 +1420,13 @@ def _populate_ir_symbols_v3(ir: LivemathIRV3, evaluator: Evaluator) -> None:
         # The NameGenerator now always produces this simple format
 
         # Create original value struct
-        original = ValueWithUnit(
-            value=entry.original_value,
-            unit=entry.original_unit
-        )
+        if entry.original_value is None and entry.original_unit is None:
+            original = _EMPTY_VALUE
+        else:
+            original = ValueWithUnit(
+                value=entry.original_value,
+                unit=entry.original_unit
+            )
 
         # Convert to base units using Pint
         if entry.original_value is not None and entry.original_unit:
@@ -1335,10 +1448,12 @@ def _populate_ir_symbols_v3(ir: LivemathIRV3, evaluator: Evaluator) -> None:
                         base_value = float(entry.si_value)
                 except Exception:
                     pass
-            base = ValueWithUnit(
-                value=base_value if base_value is not None else entry.original_value,
-                unit=None
-            )
+            if base_value is None:
+                base_value = entry.original_value
+            if base_value is None:
+                base = _EMPTY_VALUE
+            else:
+                base = ValueWithUnit(value=base_value, unit=None)
             conversion_ok = entry.valid
             conversion_error = None
 
@@ -22,8 +22,7 @@ logger = logging.getLogger(__name__)
 
 from ..config import LivemathConfig
 from ..ir.schema import LivemathIR
-from ..parser.expression_parser import ExpressionParser
-from ..parser.expression_tokenizer import ExpressionTokenizer
+from ..parser.expression_parser import parse_expression
 from ..parser.models import Calculation
 from ..utils.errors import EvaluationError
 from .expression_evaluator import evaluate_expression_tree
@@ -73,6 +72,8 @@ class Evaluator:
         # NOTE: TokenClassifier removed in v3.0 - no longer needed with custom parser
         self._ir: LivemathIR | None = None  # Current IR being processed
         self._warning_count = 0  # ISS-017: Track warnings separately from errors
+        # True if the last evaluate() call returned error markup
+        self.last_error = False
 
     def get_warning_count(self) -> int:
         """Return the number of warnings encountered during evaluation."""
@@ -118,7 +119,7 @@ class Evaluator:
             # Update the corresponding block in IR
             if i < len(ir.blocks):
                 ir.blocks[i].latex_output = result_latex
-                if calc.operation == "ERROR" or "\\color{red}" in result_latex:
+                if self.last_error:
                     ir.blocks[i].error = calc.error_message or "Evaluation error"
                     stats["errors"] += 1
 
@@ -134,9 +135,8 @@ class Evaluator:
                 stats["symbolic"] += 1
 
         # Update IR with symbol values from SymbolTable
-        for name in self.symbols.all_names():
-            entry = self.symbols.get(name)
-            if entry and name in ir.symbols:
+        for name, entry in self.symbols.items():
+            if name in ir.symbols:
                 ir_entry = ir.symbols[name]
 
                 # Update internal_name in mapping (v0, v1, ... format)
@@ -200,9 +200,11 @@ class Evaluator:
             line: Source line number for tracking
 
         Returns:
-            LaTeX string with the calculation result
+            LaTeX string with the calculation result. If it is an error
+            (\\color{red} markup), last_error is set to True.
         """
         self._current_line = line  # Store for use in handlers
+        self.last_error = False
         # Apply expression-level config overrides for this calculation
         calc_config = self.config
         if config_overrides:
@@ -211,6 +213,7 @@ class Evaluator:
         try:
             if calculation.operation == "ERROR":
                 # Return error on new line, formatted for markdown readability
+                self.last_error = True
                 err_msg = self._escape_latex_text(calculation.error_message or "Unknown error")
                 return f"{calculation.latex}\n\\\\ \\color{{red}}{{\\text{{\n    Error: {err_msg}}}}}"
             elif calculation.operation == ":=":
@@ -229,6 +232,7 @@ class Evaluator:
                 return ""
         except Exception as e:
             # Return error on new line, formatted for markdown readability
+            self.last_error = True
             err_msg = self._escape_latex_text(str(e))
             return f"{calculation.latex}\n\\\\ \\color{{red}}{{\\text{{\n    Error: {err_msg}}}}}"
 
@@ -1543,54 +1547,47 @@ class Evaluator:
         # Build symbol map from our symbol table
         # Map internal IDs (v0, v1, ...) to Pint Quantities or function info dicts
         symbol_map = {}
-        for name in self.symbols.all_names():
-            entry = self.symbols.get(name)
-            if entry:
-                # Check if this is a function definition (has parameters)
-                if hasattr(entry, 'parameters') and entry.parameters:
-                    # Store function info as a dict with formula and parameters
-                    func_info = {
-                        "formula": entry.formula_expression if hasattr(entry, 'formula_expression') else "",
-                        "parameters": entry.parameters,
-                    }
-                    # Store under internal_id for rewritten expressions like f0(0.9)
+        for name, entry in self.symbols.items():
+            # Check if this is a function definition (has parameters)
+            if hasattr(entry, 'parameters') and entry.parameters:
+                # Store function info as a dict with formula and parameters
+                func_info = {
+                    "formula": entry.formula_expression if hasattr(entry, 'formula_expression') else "",
+                    "parameters": entry.parameters,
+                }
+                # Store under internal_id for rewritten expressions like f0(0.9)
+                if hasattr(entry, 'internal_id') and entry.internal_id:
+                    symbol_map[entry.internal_id] = func_info
+                # Store under latex_name for function calls like PPE_{eff}(0.9)
+                if hasattr(entry, 'latex_name') and entry.latex_name:
+                    symbol_map[entry.latex_name] = func_info
+                symbol_map[name] = func_info
+            else:
+                # Check if this is an array value
+                if hasattr(entry, 'value') and isinstance(entry.value, list):
+                    # Array - store directly (already a list of Pint Quantities)
+                    array_value = entry.value
+                    # Store under internal_id for parser lookup (v0, v1, etc.)
                     if hasattr(entry, 'internal_id') and entry.internal_id:
-                        symbol_map[entry.internal_id] = func_info
-                    # Store under latex_name for function calls like PPE_{eff}(0.9)
+                        symbol_map[entry.internal_id] = array_value
+                    # Also store under latex_name and original name for fallback
                     if hasattr(entry, 'latex_name') and entry.latex_name:
-                        symbol_map[entry.latex_name] = func_info
-                    symbol_map[name] = func_info
+                        symbol_map[entry.latex_name] = array_value
+                    symbol_map[name] = array_value
                 else:
-                    # Check if this is an array value
-                    if hasattr(entry, 'value') and isinstance(entry.value, list):
-                        # Array - store directly (already a list of Pint Quantities)
-                        array_value = entry.value
+                    # Regular variable - convert to Pint Quantity
+                    pint_qty = self._symbol_to_pint_quantity(entry, ureg)
+                    if pint_qty is not None:
                         # Store under internal_id for parser lookup (v0, v1, etc.)
                         if hasattr(entry, 'internal_id') and entry.internal_id:
-                            symbol_map[entry.internal_id] = array_value
+                            symbol_map[entry.internal_id] = pint_qty
                         # Also store under latex_name and original name for fallback
                         if hasattr(entry, 'latex_name') and entry.latex_name:
-                            symbol_map[entry.latex_name] = array_value
-                        symbol_map[name] = array_value
-                    else:
-                        # Regular variable - convert to Pint Quantity
-                        pint_qty = self._symbol_to_pint_quantity(entry, ureg)
-                        if pint_qty is not None:
-                            # Store under internal_id for parser lookup (v0, v1, etc.)
-                            if hasattr(entry, 'internal_id') and entry.internal_id:
-                                symbol_map[entry.internal_id] = pint_qty
-                            # Also store under latex_name and original name for fallback
-                            if hasattr(entry, 'latex_name') and entry.latex_name:
-                                symbol_map[entry.latex_name] = pint_qty
-                            symbol_map[name] = pint_qty
-
-        # Tokenize the rewritten expression
-        tokenizer = ExpressionTokenizer(modified_latex)
-        tokens = tokenizer.tokenize()
-
-        # Parse
-        parser = ExpressionParser(tokens)
-        tree = parser.parse()
+                            symbol_map[entry.latex_name] = pint_qty
+                        symbol_map[name] = pint_qty
+
+        # Tokenize and parse (tree memoized per expression text)
+        tree = parse_expression(modified_latex)
 
         # Evaluate
         result = evaluate_expression_tree(tree, symbol_map, ureg)
@@ -460,10 +460,8 @@ def _eval_function_call(
         local_symbols[param_name] = arg_value
 
     # Parse and evaluate the function's formula with substituted parameters
-    from livemathtex.parser.expression_parser import ExpressionParser
-    from livemathtex.parser.expression_tokenizer import ExpressionTokenizer
+    from livemathtex.parser.expression_parser import parse_expression
 
-    tokens = ExpressionTokenizer(formula_expr).tokenize()
-    tree = ExpressionParser(tokens).parse()
+    tree = parse_expression(formula_expr)
 
     return _eval_node(tree, local_symbols, ureg)
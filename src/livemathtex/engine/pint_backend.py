@@ -14,6 +14,7 @@ Key features:
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import pint
@@ -21,6 +22,10 @@ import pint
 # Global Pint UnitRegistry instance
 _ureg: pint.UnitRegistry | None = None
 
+# Bumped whenever units are defined or the registry is reset, so caches of
+# results that depend on which units exist can key on it
+_registry_generation = 0
+
 # LaTeX wrapper pattern for extracting unit from LaTeX text commands
 _LATEX_WRAPPER_PATTERN = re.compile(
     r'^\\(?:text|mathrm|mathit|textit|mathbf)\{([^}]+)\}$'
@@ -54,6 +59,28 @@ def get_unit_registry() -> pint.UnitRegistry:
     return _ureg
 
 
+def registry_generation() -> int:
+    """
+    Get a counter that changes whenever the set of known units changes.
+
+    Callers that cache results depending on the unit registry (such as
+    parsed expression trees) include it in their cache key.
+    """
+    return _registry_generation
+
+
+def invalidate_unit_caches() -> None:
+    """
+    Invalidate caches that depend on the unit registry.
+
+    Call this after defining units on the Pint registry directly; the
+    define_custom_unit*() functions and reset_unit_registry() already do.
+    """
+    global _registry_generation
+    _registry_generation += 1
+    _base_unit_factor.cache_clear()
+
+
 def _setup_custom_units(ureg: pint.UnitRegistry) -> None:
     """
     Add custom unit definitions to the registry.
@@ -83,16 +110,6 @@ def _setup_custom_units(ureg: pint.UnitRegistry) -> None:
         pass
 
 
-def reset_unit_registry() -> None:
-    """
-    Reset the Pint registry.
-
-    Useful for testing to ensure a clean state.
-    """
-    global _ureg
-    _ureg = None
-
-
 def _unwrap_latex(token: str) -> str:
     """
     Extract unit name from LaTeX text wrappers.
@@ -578,6 +595,7 @@ def define_custom_unit(definition: str) -> bool:
 
     try:
         ureg.define(pint_def)
+        invalidate_unit_caches()
         return True
     except (pint.errors.RedefinitionError, pint.errors.DefinitionSyntaxError):
         return False
@@ -625,6 +643,7 @@ def define_custom_unit_from_latex(unit_name: str, definition: str) -> bool:
             # Define as new base unit with its own dimension
             try:
                 ureg.define(f'{clean_name} = [{clean_name}]')
+                invalidate_unit_caches()
                 return True
             except pint.errors.RedefinitionError:
                 return True  # Already defined
@@ -643,6 +662,7 @@ def define_custom_unit_from_latex(unit_name: str, definition: str) -> bool:
         # Try to define as derived unit
         pint_def = f'{clean_name} = {clean_def}'
         ureg.define(pint_def)
+        invalidate_unit_caches()
         return True
 
     except pint.errors.RedefinitionError:
@@ -703,17 +723,21 @@ def convert_to_base_units(value: float, unit: str | None) -> ConversionResult:
             success=True
         )
 
-    ureg = get_unit_registry()
-
     try:
-        quantity = value * ureg(unit)
-        base = quantity.to_base_units()
+        factor = _base_unit_factor(unit)
+        if factor is None:
+            # Offset unit (degC): the conversion is not a plain factor
+            quantity = value * get_unit_registry()(unit)
+            base = quantity.to_base_units()
+            base_value, base_unit = float(base.magnitude), format_pint_unit(base.units)
+        else:
+            base_value, base_unit = value * factor[0], factor[1]
 
         return ConversionResult(
             original_value=value,
             original_unit=unit,
-            base_value=float(base.magnitude),
-            base_unit=format_pint_unit(base.units),
+            base_value=base_value,
+            base_unit=base_unit,
             success=True
         )
     except Exception as e:
@@ -727,6 +751,28 @@ def convert_to_base_units(value: float, unit: str | None) -> ConversionResult:
         )
 
 
+@lru_cache(maxsize=1024)
+def _base_unit_factor(unit: str) -> tuple[float, str] | None:
+    """
+    Get the SI base-unit factor and base-unit string for a unit (memoized).
+
+    Parsing a unit string and reducing it to base units dominates the cost
+    of convert_to_base_units(), and documents reuse a handful of units, so
+    the result for 1 unit is cached and scaled by the value.
+
+    Returns:
+        (factor, base_unit), or None for non-multiplicative (offset) units.
+        Parse errors propagate and are not cached.
+    """
+    ureg = get_unit_registry()
+    quantity = ureg(unit)
+    # Offset units (degC) map zero to a non-zero base value: not a plain factor
+    if ureg.Quantity(0.0, quantity.units).to_base_units().magnitude != 0:
+        return None
+    base = quantity.to_base_units()
+    return float(base.magnitude), format_pint_unit(base.units)
+
+
 def format_pint_unit(unit: pint.Unit) -> str:
     """
     Format a Pint unit to a clean string representation.
@@ -1512,11 +1558,18 @@ def reset_custom_unit_registry():
 UnitRegistry = CustomUnitRegistry
 
 
-def reset_unit_registry():
-    """Reset both Pint and custom unit registries (for testing)."""
+def reset_unit_registry() -> None:
+    """
+    Reset both Pint and custom unit registries (for testing).
+
+    The Pint registry is only dropped here; it is rebuilt lazily by the
+    next get_unit_registry() call, so a reset costs nothing for documents
+    that never touch a unit.
+    """
     reset_custom_unit_registry()
     global _ureg
     _ureg = None
+    invalidate_unit_caches()
 
 
 # =============================================================================
@@ -320,5 +320,9 @@ class SymbolTable:
         """Return all defined symbol names."""
         return list(self._symbols.keys())
 
+    def items(self) -> list[tuple[str, SymbolValue]]:
+        """Return (name, SymbolValue) pairs for all defined symbols."""
+        return list(self._symbols.items())
+
     def __contains__(self, name: str) -> bool:
         return name in self._symbols
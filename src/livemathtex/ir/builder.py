@@ -14,8 +14,8 @@ import re
 from pathlib import Path
 
 from ..parser.lexer import Lexer
-from ..parser.models import Calculation, Document, MathBlock
-from .schema import CustomUnitEntry, LivemathIR, LivemathIRV3, SymbolEntry
+from ..parser.models import Calculation, Document
+from .schema import CustomUnitEntry, LivemathIR, LivemathIRV3, SymbolEntry, load_json
 
 
 class IRBuilder:
@@ -45,16 +45,15 @@ class IRBuilder:
         ir = LivemathIR(source=source)
 
         # Extract custom unit definitions
-        for block in document.children:
-            if isinstance(block, MathBlock):
-                calculations = self.lexer.extract_calculations(block)
-                for calc in calculations:
-                    if calc.operation == "===":
-                        # Unit definition: unit === expr
-                        unit_name = calc.target.strip() if calc.target else ""
-                        definition = calc.original_result.strip() if calc.original_result else ""
-                        if unit_name:
-                            ir.custom_units[unit_name] = definition
+        for block in document.math_blocks:
+            calculations = self.lexer.extract_calculations(block)
+            for calc in calculations:
+                if calc.operation == "===":
+                    # Unit definition: unit === expr
+                    unit_name = calc.target.strip() if calc.target else ""
+                    definition = calc.original_result.strip() if calc.original_result else ""
+                    if unit_name:
+                        ir.custom_units[unit_name] = definition
 
         return ir
 
@@ -90,10 +89,7 @@ class IRBuilder:
             }
         }
         """
-        import json
-
-        with open(library_path, encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(library_path)
 
         for name, entry_data in data.get("symbols", {}).items():
             entry = SymbolEntry.from_dict(entry_data)
@@ -121,16 +117,15 @@ class IRBuilder:
         ir.unit_backend = {"name": "pint", "version": pint.__version__}
 
         # Extract custom unit definitions with full metadata
-        for block in document.children:
-            if isinstance(block, MathBlock):
-                calculations = self.lexer.extract_calculations(block)
-                for calc in calculations:
-                    if calc.operation == "===":
-                        entry = self._parse_unit_definition(calc)
-                        if entry:
-                            ir.add_custom_unit(calc.target.strip(), entry)
-                            # Register in Pint
-                            self._register_pint_unit(entry)
+        for block in document.math_blocks:
+            calculations = self.lexer.extract_calculations(block)
+            for calc in calculations:
+                if calc.operation == "===":
+                    entry = self._parse_unit_definition(calc)
+                    if entry:
+                        ir.add_custom_unit(calc.target.strip(), entry)
+                        # Register in Pint
+                        self._register_pint_unit(entry)
 
         return ir
 
@@ -233,12 +228,13 @@ class IRBuilder:
         """
         import pint
 
-        from ..engine.pint_backend import get_unit_registry
+        from ..engine.pint_backend import get_unit_registry, invalidate_unit_caches
 
         ureg = get_unit_registry()
 
         try:
             ureg.define(entry.pint_definition)
+            invalidate_unit_caches()
             return True
         except (pint.errors.RedefinitionError, pint.errors.DefinitionSyntaxError):
             # Unit already defined or invalid syntax
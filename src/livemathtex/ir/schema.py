@@ -19,11 +19,42 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from ..utils.fileio import write_document
 
-@dataclass
+# orjson is an optional speedup for reading large IR files
+# (pip install livemathtex[fast]); the stdlib json module is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: Path | str) -> Any:
+    """
+    Load a JSON file, using orjson when it is installed.
+
+    Files orjson rejects but the stdlib accepts (e.g. NaN/Infinity literals
+    written by json.dump) fall back to json.loads.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The decoded JSON data
+    """
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+@dataclass(frozen=True, slots=True)
 class ValueWithUnit:
     """
-    A numeric value with optional unit.
+    A numeric value with optional unit (immutable, so instances can be shared).
 
     Attributes:
         value: The numeric value (None if evaluation failed)
@@ -50,7 +81,7 @@ class ValueWithUnit:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolEntry:
     """
     Complete information about a defined symbol.
@@ -96,7 +127,7 @@ class SymbolEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class IRError:
     """
     An error that occurred during processing.
@@ -124,7 +155,7 @@ class IRError:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LivemathIR:
     """
     Complete Intermediate Representation for a livemathtex document.
@@ -171,36 +202,30 @@ class LivemathIR:
         }
 
     def to_json(self, path: Path) -> None:
-        """Write IR to JSON file for debugging."""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        """Write IR to JSON file for debugging (serialized, then one write)."""
+        write_document(path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
 
     @classmethod
     def from_dict(cls, data: dict) -> 'LivemathIR':
         """Create IR from dict."""
-        ir = cls(
+        symbol_from_dict = SymbolEntry.from_dict
+        error_from_dict = IRError.from_dict
+        return cls(
             version=data.get("version", "2.0"),
             source=data.get("source", ""),
             custom_units=data.get("custom_units", {}),
+            symbols={
+                name: symbol_from_dict(entry_data)
+                for name, entry_data in data.get("symbols", {}).items()
+            },
+            errors=[error_from_dict(error_data) for error_data in data.get("errors", [])],
             stats=data.get("stats", {}),
         )
 
-        # Load symbols
-        for name, entry_data in data.get("symbols", {}).items():
-            ir.symbols[name] = SymbolEntry.from_dict(entry_data)
-
-        # Load errors
-        for error_data in data.get("errors", []):
-            ir.errors.append(IRError.from_dict(error_data))
-
-        return ir
-
     @classmethod
     def from_json(cls, path: Path) -> 'LivemathIR':
         """Load IR from JSON file."""
-        with open(path, encoding='utf-8') as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        return cls.from_dict(load_json(path))
 
 
 # =============================================================================
@@ -208,7 +233,7 @@ class LivemathIR:
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class FormulaInfo:
     """
     Information about a formula expression.
@@ -247,7 +272,7 @@ class FormulaInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomUnitEntry:
     """
     Metadata about a custom unit definition.
@@ -283,7 +308,7 @@ class CustomUnitEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolEntryV3:
     """
     Complete information about a defined symbol in v3.0 schema.
@@ -338,7 +363,7 @@ class SymbolEntryV3:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LivemathIRV3:
     """
     Complete Intermediate Representation v3.0.
@@ -418,40 +443,39 @@ class LivemathIRV3:
         }
 
     def to_json(self, path: Path) -> None:
-        """Write IR to JSON file for debugging."""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        """Write IR to JSON file for debugging (serialized, then one write)."""
+        write_document(path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
 
     @classmethod
     def from_dict(cls, data: dict) -> 'LivemathIRV3':
         """Create IR from dict."""
-        ir = cls(
+        symbol_from_dict = SymbolEntryV3.from_dict
+        unit_from_dict = CustomUnitEntry.from_dict
+        error_from_dict = IRError.from_dict
+        symbols = {
+            clean_id: symbol_from_dict(entry_data)
+            for clean_id, entry_data in data.get("symbols", {}).items()
+        }
+        return cls(
             version=data.get("version", "3.0"),
             source=data.get("source", ""),
             unit_backend=data.get("unit_backend", {"name": "pint", "version": ""}),
+            custom_units={
+                name: unit_from_dict(entry_data)
+                for name, entry_data in data.get("custom_units", {}).items()
+            },
+            symbols=symbols,
+            errors=[error_from_dict(error_data) for error_data in data.get("errors", [])],
             stats=data.get("stats", {}),
+            # Reverse lookup latex_name -> clean ID (last definition wins)
+            _latex_to_id={
+                entry.latex_name: clean_id
+                for clean_id, entry in symbols.items()
+                if entry.latex_name
+            },
         )
 
-        # Load custom units
-        for name, entry_data in data.get("custom_units", {}).items():
-            ir.custom_units[name] = CustomUnitEntry.from_dict(entry_data)
-
-        # Load symbols
-        for clean_id, entry_data in data.get("symbols", {}).items():
-            entry = SymbolEntryV3.from_dict(entry_data)
-            ir.symbols[clean_id] = entry
-            if entry.latex_name:
-                ir._latex_to_id[entry.latex_name] = clean_id
-
-        # Load errors
-        for error_data in data.get("errors", []):
-            ir.errors.append(IRError.from_dict(error_data))
-
-        return ir
-
     @classmethod
     def from_json(cls, path: Path) -> 'LivemathIRV3':
         """Load IR from JSON file."""
-        with open(path, encoding='utf-8') as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        return cls.from_dict(load_json(path))
@@ -12,6 +12,16 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .markdown_parser import ParsedMathBlock
 
+# Patterns applied to every calculation line, compiled once at import
+_OPERATOR_RE = re.compile(r'===|:=|==|=>')
+# Bare '=' that is not part of :=, ==, => or ===
+_BARE_EQUALS_RE = re.compile(r'(?<!:)(?<!>)(?<!=)=(?!=)(?!>)')
+# Inline unit hint [unit] at the end of a result
+_UNIT_HINT_TAIL_RE = re.compile(r'\[([^\]]+)\]\s*$')
+# Value comment parts: trailing :precision and [unit]
+_PRECISION_TAIL_RE = re.compile(r'\s*:\s*(\d+)\s*$')
+_VALUE_UNIT_TAIL_RE = re.compile(r'\s*\[(.*?)\]\s*$')
+
 
 @dataclass
 class Span:
@@ -79,7 +89,7 @@ def parse_calculation_line(
     content_start = line_start_offset + leading_ws
 
     # Check for operators (in priority order)
-    has_operators = bool(re.search(r'===|:=|==|=>', stripped))
+    has_operators = bool(_OPERATOR_RE.search(stripped))
 
     if not has_operators:
         return None
@@ -88,7 +98,7 @@ def parse_calculation_line(
 
     # Check for bare '=' error (not part of :=, ==, =>, ===)
     # Need to also exclude => (the = before >)
-    if re.search(r'(?<!:)(?<!>)(?<!=)=(?!=)(?!>)', stripped):
+    if _BARE_EQUALS_RE.search(stripped):
         return ParsedCalculation(
             operation="ERROR",
             operator_span=Span(content_start, content_start + len(stripped)),
@@ -137,7 +147,7 @@ def parse_calculation_line(
             # Check for inline unit hint [unit] at end
             unit_hint = unit_comment
             unit_hint_span = None
-            unit_match = re.search(r'\[([^\]]+)\]\s*$', result_part)
+            unit_match = _UNIT_HINT_TAIL_RE.search(result_part)
             if unit_match and not unit_hint:
                 unit_hint = unit_match.group(1).strip()
                 unit_hint_start = content_start + assign_idx + 2 + eval_idx + 2 + result_part.find('[')
@@ -188,7 +198,7 @@ def parse_calculation_line(
         # Check for inline unit hint [unit] at end
         unit_hint = unit_comment
         unit_hint_span = None
-        unit_match = re.search(r'\[([^\]]+)\]\s*$', result_part)
+        unit_match = _UNIT_HINT_TAIL_RE.search(result_part)
         if unit_match and not unit_hint:
             unit_hint = unit_match.group(1).strip()
             # Find [ position in original stripped string (not in result_part)
@@ -262,13 +272,13 @@ def parse_math_block_calculations(
         value_str = value_comment.strip()
 
         # Extract precision (at end, after :)
-        precision_match = re.search(r'\s*:\s*(\d+)\s*$', value_str)
+        precision_match = _PRECISION_TAIL_RE.search(value_str)
         if precision_match:
             value_str = value_str[:precision_match.start()].strip()
 
         # Extract unit (in square brackets)
         target_unit = None
-        unit_match = re.search(r'\s*\[(.*?)\]\s*$', value_str)
+        unit_match = _VALUE_UNIT_TAIL_RE.search(value_str)
         if unit_match:
             target_unit = unit_match.group(1).strip()
             value_str = value_str[:unit_match.start()].strip()
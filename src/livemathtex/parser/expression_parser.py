@@ -12,9 +12,10 @@ Key design principles:
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 
-from livemathtex.engine.pint_backend import is_pint_unit
-from livemathtex.parser.expression_tokenizer import Token, TokenType
+from livemathtex.engine.pint_backend import is_pint_unit, registry_generation
+from livemathtex.parser.expression_tokenizer import ExpressionTokenizer, Token, TokenType
 
 
 class ParseError(Exception):
@@ -664,3 +665,30 @@ class ExpressionParser:
                 self._advance()
                 return True
         return False
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str, generation: int) -> ExprNode:
+    """Parse text once per distinct expression and unit registry state."""
+    return ExpressionParser(ExpressionTokenizer(text).tokenize()).parse()
+
+
+def parse_expression(text: str) -> ExprNode:
+    """
+    Tokenize and parse a LaTeX expression, memoizing the expression tree.
+
+    The parser checks names against the unit registry, so the cache is keyed
+    on the registry generation as well as the text: defining a unit makes
+    later parses start afresh. The returned tree is shared between callers
+    and must not be mutated.
+
+    Args:
+        text: LaTeX expression text
+
+    Returns:
+        Root node of the expression tree
+
+    Raises:
+        ParseError: If the expression cannot be parsed (not cached)
+    """
+    return _parse_cached(text, registry_generation())
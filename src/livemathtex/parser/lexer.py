@@ -1,8 +1,106 @@
 import re
+from functools import lru_cache
 from typing import Any
 
 from .models import Calculation, Document, MathBlock, SourceLocation, TextBlock
 
+# Regex for fenced code blocks (``` or ~~~)
+_CODE_BLOCK_RE = re.compile(r'```[\s\S]*?```|~~~[\s\S]*?~~~')
+
+# Regex for document-level directives: <!-- livemathtex: key=value, ... -->
+_DOCUMENT_DIRECTIVE_RE = re.compile(
+    r'<!--\s*livemathtex:\s*([^>]+)\s*-->',
+    re.IGNORECASE
+)
+
+
+def _parse_directive_value(value: str) -> Any:
+    """
+    Parse a directive/config value to appropriate Python type.
+
+    Handles:
+    - Booleans: true/false/yes/no/1/0
+    - Integers: 123
+    - Floats: 1.23, 1e-12
+    - Strings: everything else (quotes stripped)
+
+    Args:
+        value: String value to parse
+
+    Returns:
+        Parsed value in appropriate Python type
+    """
+    value = value.strip()
+
+    # Boolean
+    if value.lower() in ('true', 'yes', '1'):
+        return True
+    if value.lower() in ('false', 'no', '0'):
+        return False
+
+    # Integer
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    # Float (including scientific notation)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    # String (remove quotes if present)
+    return value.strip('"\'')
+
+
+def parse_document_directives(content: str) -> dict[str, Any]:
+    """
+    Extract livemathtex config directives from document content.
+
+    Syntax: <!-- livemathtex: key=value, key2=value2 -->
+
+    These directives set document-wide configuration and are typically
+    placed at the top of the document.
+
+    Note: Directives inside fenced code blocks (``` or ~~~) are ignored.
+    This prevents example directives in documentation from being parsed.
+
+    Args:
+        content: Full document text
+
+    Returns:
+        Dictionary of configuration key-value pairs.
+        Empty dict if no directives found.
+
+    Example:
+        >>> content = '<!-- livemathtex: digits=6, format=engineering -->'
+        >>> parse_document_directives(content)
+        {'digits': 6, 'format': 'engineering'}
+    """
+    directives: dict[str, Any] = {}
+
+    # Most documents carry no directive at all: one scan for the directive
+    # marker avoids copying the whole document to strip code blocks.
+    if not _DOCUMENT_DIRECTIVE_RE.search(content):
+        return directives
+
+    # Strip fenced code blocks before scanning for directives (ISSUE-004)
+    # This prevents example directives in documentation from being parsed
+    content_for_scan = _CODE_BLOCK_RE.sub('', content)
+
+    for match in _DOCUMENT_DIRECTIVE_RE.finditer(content_for_scan):
+        pairs_str = match.group(1)
+        for pair in pairs_str.split(','):
+            pair = pair.strip()
+            if '=' in pair:
+                key, value = pair.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                directives[key] = _parse_directive_value(value)
+
+    return directives
+
 
 class Lexer:
     """
@@ -57,17 +155,18 @@ class Lexer:
 
     # Regex for finding fenced code blocks (``` or ~~~)
     # These should be skipped - we don't process math inside code blocks
-    CODE_BLOCK_RE = re.compile(r'```[\s\S]*?```|~~~[\s\S]*?~~~')
+    CODE_BLOCK_RE = _CODE_BLOCK_RE
 
     def parse(self, text: str) -> Document:
         """Parse the full document text."""
         children = []
         last_pos = 0
 
-        # Calculate line offsets for location tracking
-        line_offsets = [0]
-        for match in re.finditer(r'\n', text):
-            line_offsets.append(match.end())
+        # Line numbers for location tracking are counted up to each math
+        # block as it is found (positions only increase), so a document
+        # without math is never scanned for newlines
+        line = 1
+        counted = 0
 
         # Find all code block regions to exclude
         code_block_regions = [(m.start(), m.end()) for m in self.CODE_BLOCK_RE.finditer(text)]
@@ -109,8 +208,11 @@ class Lexer:
 
             # Calculate location
             # (Simplified location tracking - to be enhanced if needed for error reporting)
-            start_line = self._get_line_number(match.start(), line_offsets)
-            end_line = self._get_line_number(match.end(), line_offsets)
+            line += text.count('\n', counted, match.start())
+            start_line = line
+            line += text.count('\n', match.start(), match.end())
+            end_line = line
+            counted = match.end()
 
             math_block = MathBlock(
                 content=match.group(0), # The FULL match including comment is the "content" we step over
@@ -134,15 +236,8 @@ class Lexer:
 
         return Document(children=children)
 
-    def _get_line_number(self, pos: int, line_offsets: list[int]) -> int:
-        """Binary search or simple scan to find line number."""
-        # Simple scan is fine for MVP
-        for i, offset in enumerate(line_offsets):
-            if pos < offset:
-                return i
-        return len(line_offsets)
-
-    def extract_calculations(self, math_block: MathBlock) -> list[Calculation]:
+    @staticmethod
+    def extract_calculations(math_block: MathBlock) -> list[Calculation]:
         """
         Analyze a MathBlock to find specific calculation requests.
         Handles multiline blocks by treating each line as a potential separate calculation.
@@ -152,7 +247,16 @@ class Lexer:
 
         Special case: <!-- value --> or <!-- value:unit --> or <!-- value:unit:precision -->
         triggers a "value" operation that displays the value of a previously defined variable.
+
+        The result depends only on the (frozen) block, so it is memoized:
+        IRBuilder and the processing loop extract each block once between
+        them. Each call returns a new list of the shared (frozen) calculations.
         """
+        return list(_extract_calculations_cached(math_block))
+
+    @staticmethod
+    def _extract_calculations(math_block: MathBlock) -> list[Calculation]:
+        """Find the calculations in a MathBlock (uncached, see extract_calculations)."""
         content = math_block.inner_content
         lines = content.split('\n')
         calculations = []
@@ -331,10 +435,7 @@ class Lexer:
     # =========================================================================
 
     # Regex for document-level directives: <!-- livemathtex: key=value, ... -->
-    DOCUMENT_DIRECTIVE_RE = re.compile(
-        r'<!--\s*livemathtex:\s*([^>]+)\s*-->',
-        re.IGNORECASE
-    )
+    DOCUMENT_DIRECTIVE_RE = _DOCUMENT_DIRECTIVE_RE
 
     # Regex for expression-level config overrides: <!-- key:value key2:value2 -->
     # These use colon (key:value) to distinguish from document directives (key=value)
@@ -343,49 +444,8 @@ class Lexer:
     # Regex for flag-style config (no value): <!-- trailing_zeros -->
     EXPRESSION_FLAG_RE = re.compile(r'\b(trailing_zeros)\b(?!:)')
 
-    def parse_document_directives(self, content: str) -> dict[str, Any]:
-        """
-        Extract livemathtex config directives from document content.
-
-        Syntax: <!-- livemathtex: key=value, key2=value2 -->
-
-        These directives set document-wide configuration and are typically
-        placed at the top of the document.
-
-        Note: Directives inside fenced code blocks (``` or ~~~) are ignored.
-        This prevents example directives in documentation from being parsed.
-
-        Args:
-            content: Full document text
-
-        Returns:
-            Dictionary of configuration key-value pairs.
-            Empty dict if no directives found.
-
-        Example:
-            >>> lexer = Lexer()
-            >>> content = '<!-- livemathtex: digits=6, format=engineering -->'
-            >>> lexer.parse_document_directives(content)
-            {'digits': 6, 'format': 'engineering'}
-        """
-        directives: dict[str, Any] = {}
-
-        # Strip fenced code blocks before scanning for directives (ISSUE-004)
-        # This prevents example directives in documentation from being parsed
-        content_for_scan = re.sub(r'```[\s\S]*?```', '', content)
-        content_for_scan = re.sub(r'~~~[\s\S]*?~~~', '', content_for_scan)
-
-        for match in self.DOCUMENT_DIRECTIVE_RE.finditer(content_for_scan):
-            pairs_str = match.group(1)
-            for pair in pairs_str.split(','):
-                pair = pair.strip()
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    directives[key] = self._parse_directive_value(value)
-
-        return directives
+    # Kept on the class for API compatibility: Lexer.parse_document_directives()
+    parse_document_directives = staticmethod(parse_document_directives)
 
     def parse_expression_overrides(self, comment: str) -> dict[str, Any]:
         """
@@ -437,44 +497,7 @@ class Lexer:
 
         return overrides
 
-    def _parse_directive_value(self, value: str) -> Any:
-        """
-        Parse a directive/config value to appropriate Python type.
-
-        Handles:
-        - Booleans: true/false/yes/no/1/0
-        - Integers: 123
-        - Floats: 1.23, 1e-12
-        - Strings: everything else (quotes stripped)
-
-        Args:
-            value: String value to parse
-
-        Returns:
-            Parsed value in appropriate Python type
-        """
-        value = value.strip()
-
-        # Boolean
-        if value.lower() in ('true', 'yes', '1'):
-            return True
-        if value.lower() in ('false', 'no', '0'):
-            return False
-
-        # Integer
-        try:
-            return int(value)
-        except ValueError:
-            pass
-
-        # Float (including scientific notation)
-        try:
-            return float(value)
-        except ValueError:
-            pass
-
-        # String (remove quotes if present)
-        return value.strip('"\'')
+    _parse_directive_value = staticmethod(_parse_directive_value)
 
     def extract_config_from_comment(self, math_block: MathBlock) -> dict[str, Any]:
         """
@@ -494,3 +517,9 @@ class Lexer:
             return self.parse_expression_overrides(math_block.config_comment)
 
         return {}
+
+
+@lru_cache(maxsize=1024)
+def _extract_calculations_cached(math_block: MathBlock) -> tuple[Calculation, ...]:
+    """Extract calculations once per distinct block (calculations are frozen)."""
+    return tuple(Lexer._extract_calculations(math_block))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 
 
 @dataclass(frozen=True)
@@ -25,6 +26,11 @@ class MathBlock(Node):
     value_comment: str | None = None  # e.g. "value" or "value:kW" or "value:kW:2"
     config_comment: str | None = None  # e.g. "digits:6 format:sci" for overrides
 
+    @property
+    def start_line(self) -> int:
+        """First source line of the block (0 if the location is unknown)."""
+        return self.location.start_line if self.location else 0
+
 @dataclass(kw_only=True, frozen=True)
 class Calculation(Node):
     """Represents a calculable portion of a math block."""
@@ -45,3 +51,8 @@ class TextBlock(Node):
 class Document(Node):
     """Root node representing the entire parsed document."""
     children: list[TextBlock | MathBlock] = field(default_factory=list)
+
+    @cached_property
+    def math_blocks(self) -> list[MathBlock]:
+        """The MathBlock children, in document order (computed once)."""
+        return [child for child in self.children if isinstance(child, MathBlock)]
@@ -1,4 +1,4 @@
-from ..parser.models import Document, MathBlock, Node, TextBlock
+from ..parser.models import Document, MathBlock, TextBlock
 
 
 class MarkdownRenderer:
@@ -7,19 +7,27 @@ class MarkdownRenderer:
     incorporating calculation results.
     """
 
-    def render(self, document: Document, calculations: dict[Node, str], metadata: dict[str, str] = None) -> str:
+    def render(
+        self,
+        document: Document,
+        calculations: list[str | tuple[str, str | None] | None],
+        metadata: dict[str, str] = None,
+    ) -> str:
         """
         Reconstruct document text from AST and calculated results.
         Injects/Updates metadata footer at the bottom if provided.
 
-        Note: calculations dict values can be either:
+        Note: calculations holds one entry per document.math_blocks item,
+        in the same order (looked up by position, not by hashing blocks):
+        - None: The block is output unchanged
         - str: The calculated result LaTeX (legacy format)
         - tuple[str, Optional[str]]: (result, inline_unit_hint) for ISS-013 support
         """
         import re
         output = []
+        math_index = 0
 
-        for i, node in enumerate(document.children):
+        for node in document.children:
             if isinstance(node, TextBlock):
                 text = node.content
                 # Remove old top-banner style metadata
@@ -28,8 +36,9 @@ class MarkdownRenderer:
                 text = re.sub(r'\n*---\n\n> \*livemathtex:.*?<!-- livemathtex-meta -->\s*$', '', text, flags=re.DOTALL)
                 output.append(text)
             elif isinstance(node, MathBlock):
-                if node in calculations:
-                    calc_value = calculations[node]
+                calc_value = calculations[math_index]
+                math_index += 1
+                if calc_value is not None:
 
                     # ISS-013: Support tuple format (result, inline_unit_hint)
                     if isinstance(calc_value, tuple):
@@ -0,0 +1,42 @@
+"""
+File I/O helpers for livemathtex documents.
+"""
+
+import os
+from pathlib import Path
+
+
+def read_document(path: Path | str) -> str:
+    """
+    Read a UTF-8 markdown document in one bulk read and decode.
+
+    Equivalent to open(path, encoding='utf-8').read(): line endings are
+    normalized to '\\n' (universal newlines), but only when the document
+    actually contains a '\\r'.
+
+    Args:
+        path: Path to the document
+
+    Returns:
+        Document text
+    """
+    text = Path(path).read_bytes().decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def write_document(path: Path | str, text: str) -> None:
+    """
+    Write a markdown document as UTF-8 with a single encode and write.
+
+    Newlines are translated to os.linesep, as text-mode writes do, so
+    output is unchanged on every platform.
+
+    Args:
+        path: Output path
+        text: Document text
+    """
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    Path(path).write_bytes(text.encode('utf-8'))
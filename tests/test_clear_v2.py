@@ -9,7 +9,15 @@ Tests focus on:
 """
 
 import pytest
-from livemathtex.core import clear_text, process_text
+
+from livemathtex.core import (
+    _apply_edits,
+    _clear_text_regex,
+    _strip_color_markup,
+    _strip_multiline_markup,
+    clear_text,
+    process_text,
+)
 
 # Alias for backward compatibility with test names
 clear_text_v2 = clear_text
@@ -279,6 +287,20 @@ class TestEdgeCases:
         assert cleared == content
         assert count == 0
 
+    def test_unprocessed_document_unchanged(self):
+        """A document with definitions only is returned as-is."""
+        content = "# Title\n\n$x := 5$\n\nSome text.\n"
+        cleared, count = clear_text_v2(content)
+        assert cleared == content
+        assert count == 0
+
+    def test_markup_without_evaluations(self):
+        """Error markup is removed even when there is nothing to evaluate."""
+        content = "$x := \\color{red}{\\text{Error: bad}}$\n\n\n\nText\n"
+        cleared, count = clear_text_v2(content)
+        assert cleared == "$x := $\n\nText\n"
+        assert count == 0
+
     def test_empty_math_block(self):
         """Empty math block handled gracefully."""
         content = "$$$$"
@@ -319,6 +341,36 @@ $y == 10$
         assert "livemathtex-meta" not in cleared
         assert "livemathtex:" not in cleared
 
+    def test_red_markup_inside_orange_markup(self):
+        """Red markup is removed before the orange markup around it."""
+        content = "\\color{orange}{\\color{orange}{5\n\\\\ \\color{red}{\\text{\n Error: z}}=}}"
+        cleared, count = clear_text_v2(content)
+        assert cleared == ""
+        assert count == 0
+
+    def test_metadata_removed_after_definition_fixups(self):
+        """The footer is removed last, so the fixups never see the text after it."""
+        content = (
+            "==\n\n---\n\n> *livemathtex: 2024-01-01 | 1 calc | 0 errors | 0.1s*"
+            " <!-- livemathtex-meta -->\n\n$"
+        )
+        cleared, count = clear_text_v2(content)
+        assert cleared == "==\n$"
+
+    def test_overlapping_result_spans_not_duplicated(self):
+        """Calculations with overlapping result spans never repeat text."""
+        # The first == result runs past the second block's == result
+        content = r"$$=={$}$$==<!-- [m] -->5\text{m}$y"
+        cleared, count = clear_text_v2(content)
+        assert count == 2
+        assert cleared.count("==") < content.count("==")
+        assert cleared.count("<!-- [m] -->") == 0
+
+    def test_apply_edits_skips_overlapping_edit(self):
+        """An edit starting inside an already replaced span is skipped."""
+        assert _apply_edits("abcdefgh", [(5, 7, "Y"), (1, 6, "X")]) == "aXgh"
+        assert _apply_edits("abcdefgh", [(1, 3, "X"), (5, 6, "Y")]) == "aXdeYgh"
+
 
 class TestProcessThenClear:
     """Test clearing after actual processing."""
@@ -356,3 +408,32 @@ $P == E [kJ]$
         cleared, _ = clear_text_v2(content_with_hint)
         # The [kJ] hint should be preserved
         assert "[kJ]" in cleared
+
+
+class TestLegacyRegexClear:
+    """Test the deprecated _clear_text_regex fallback."""
+
+    def test_clears_inline_and_display(self):
+        """Inline and display evaluations are cleared, unit hints kept."""
+        content = "$x == 5$ and $y == [kJ]$\n\n$$z == 7$$\n\n$u === 1$"
+        cleared, count = _clear_text_regex(content)
+        assert cleared == "$x ==$ and $y == [kJ]$\n\n$$z ==$$\n\n$u === 1$"
+        assert count == 2
+
+    def test_many_dollars_without_evaluations(self):
+        """Text with many $ signs but one evaluation is scanned once."""
+        content = "$a == 1$" + " x $" * 2000 + " == "
+        cleared, count = _clear_text_regex(content)
+        assert cleared == "$a ==$" + " x $" * 2000 + " == "
+        assert count == 1
+
+    def test_error_markup_with_nested_braces(self):
+        """Red markup nesting one level is removed, deeper nesting is kept."""
+        content = r"$x := 1 \color{red}{\text{Error: a}}$ $y := \color{red}{{{z}}}$"
+        assert _strip_color_markup(content) == r"$x := 1 $ $y := \color{red}{{{z}}}$"
+
+    def test_multiline_error_block_ends_at_first_double_brace(self):
+        """A multiline block is removed up to the first }}; unclosed ones stay."""
+        unclosed = "$z := 1\n\\\\ \\color{red}{\\text{x$"
+        content = "$y := bad\n\\\\ \\color{red}{\\text{Error:\nline}}$\n" + unclosed
+        assert _strip_multiline_markup(content) == "$y := bad$\n" + unclosed
@@ -0,0 +1,153 @@
+"""
+Tests for the livemathtex command-line interface.
+"""
+
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from livemathtex.cli import main
+
+
+class TestProcessSkipUnchanged:
+    """Tests for `livemathtex process --skip-unchanged`."""
+
+    def _process(self, input_path, output_path):
+        return CliRunner().invoke(
+            main,
+            ['process', str(input_path), '-o', str(output_path), '--skip-unchanged'],
+        )
+
+    def test_second_run_is_skipped(self, tmp_path):
+        """An unchanged input with existing output is not processed again."""
+        doc = tmp_path / "doc.md"
+        out = tmp_path / "out.md"
+        doc.write_text("$x := 5$\n$x ==$\n", encoding='utf-8')
+
+        first = self._process(doc, out)
+        assert first.exit_code == 0
+        assert "✓ Processed" in first.output
+        assert (tmp_path / "doc.lmt.hash").exists()
+
+        second = self._process(doc, out)
+        assert second.exit_code == 0
+        assert "(skipped)" in second.output
+
+    def test_changed_input_is_processed(self, tmp_path):
+        """Editing the input invalidates the stored hash."""
+        doc = tmp_path / "doc.md"
+        out = tmp_path / "out.md"
+        doc.write_text("$x := 5$\n$x ==$\n", encoding='utf-8')
+        self._process(doc, out)
+
+        doc.write_text("$x := 6$\n$x ==$\n", encoding='utf-8')
+        result = self._process(doc, out)
+        assert "✓ Processed" in result.output
+        assert "6" in out.read_text(encoding='utf-8')
+
+    def test_missing_output_is_processed(self, tmp_path):
+        """A deleted output file is regenerated even if the input is unchanged."""
+        doc = tmp_path / "doc.md"
+        out = tmp_path / "out.md"
+        doc.write_text("$x := 5$\n$x ==$\n", encoding='utf-8')
+        self._process(doc, out)
+
+        out.unlink()
+        result = self._process(doc, out)
+        assert "✓ Processed" in result.output
+        assert out.exists()
+
+    def test_edited_output_is_processed(self, tmp_path):
+        """An output file changed since the last run is regenerated."""
+        doc = tmp_path / "doc.md"
+        out = tmp_path / "out.md"
+        doc.write_text("$x := 5$\n$x ==$\n", encoding='utf-8')
+        self._process(doc, out)
+
+        out.write_text("edited\n", encoding='utf-8')
+        result = self._process(doc, out)
+        assert "✓ Processed" in result.output
+        assert "edited" not in out.read_text(encoding='utf-8')
+
+    def test_inplace_second_run_is_skipped(self, tmp_path):
+        """In place, the processed document is what the next run compares against."""
+        doc = tmp_path / "doc.md"
+        doc.write_text(
+            "<!-- livemathtex: output=inplace -->\n$x := 5$\n$x ==$\n", encoding='utf-8'
+        )
+        args = ['process', str(doc), '--skip-unchanged']
+
+        first = CliRunner().invoke(main, args)
+        assert "✓ Processed" in first.output
+        second = CliRunner().invoke(main, args)
+        assert second.exit_code == 0
+        assert "(skipped)" in second.output
+
+    def test_timestamped_output_skipped_in_later_minute(self, tmp_path, monkeypatch):
+        """A timestamped output from an earlier minute still counts as up to date."""
+        doc = tmp_path / "doc.md"
+        doc.write_text("$x := 5$\n$x ==$\n", encoding='utf-8')
+        args = ['process', str(doc), '--skip-unchanged']
+
+        class FakeDatetime(datetime):
+            current = datetime(2026, 1, 6, 20, 45)
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        monkeypatch.setattr("livemathtex.config.datetime", FakeDatetime)
+        first = CliRunner().invoke(main, args)
+        assert "✓ Processed" in first.output
+
+        FakeDatetime.current = datetime(2026, 1, 6, 20, 46)
+        second = CliRunner().invoke(main, args)
+        assert "(skipped)" in second.output
+        assert [p.name for p in tmp_path.glob("doc_*.md")] == ["doc_20260106_2045.md"]
+
+
+class TestProcessMany:
+    """Tests for `livemathtex process-many`."""
+
+    def _make_docs(self, tmp_path, count=3):
+        docs = []
+        for i in range(count):
+            doc = tmp_path / f"doc{i}.md"
+            doc.write_text(
+                f"<!-- livemathtex: output=out{i}.md -->\n$x := {i + 1}$\n$x ==$\n",
+                encoding='utf-8',
+            )
+            docs.append(doc)
+        return docs
+
+    def test_sequential(self, tmp_path):
+        """With -j 1 all files are processed in-process."""
+        docs = self._make_docs(tmp_path)
+        result = CliRunner().invoke(main, ['process-many', '-j', '1', *map(str, docs)])
+        assert result.exit_code == 0, result.output
+        assert "Processed 3/3 files" in result.output
+        for i in range(3):
+            assert (tmp_path / f"out{i}.md").exists()
+
+    def test_parallel_matches_single_file_output(self, tmp_path):
+        """Worker processes write the same output as `process` would."""
+        docs = self._make_docs(tmp_path)
+        result = CliRunner().invoke(main, ['process-many', '-j', '2', *map(str, docs)])
+        assert result.exit_code == 0, result.output
+        parallel = [(tmp_path / f"out{i}.md").read_text(encoding='utf-8') for i in range(3)]
+
+        for doc in docs:
+            CliRunner().invoke(main, ['process', str(doc)])
+        single = [(tmp_path / f"out{i}.md").read_text(encoding='utf-8') for i in range(3)]
+
+        # Compare without the metadata footer (timestamp and duration differ)
+        assert [t.split("\n---\n")[0] for t in parallel] == [t.split("\n---\n")[0] for t in single]
+
+    def test_failure_sets_exit_code(self, tmp_path):
+        """A file that cannot be processed is reported and fails the run."""
+        good = self._make_docs(tmp_path, count=1)[0]
+        bad = tmp_path / "bad.md"
+        bad.write_bytes(b"\xff\xfe not utf-8")
+        result = CliRunner().invoke(main, ['process-many', '-j', '1', str(good), str(bad)])
+        assert result.exit_code == 1
+        assert "Processed 1/2 files" in result.output
@@ -0,0 +1,93 @@
+"""
+Tests for file-based configuration loading (LivemathConfig.load).
+
+LivemathConfig.load() memoizes per set of config files, keyed on each
+file's path, mtime and size, so repeated loads for documents sharing a
+config are cheap while edits to a config file are still picked up.
+"""
+
+from livemathtex.config import LivemathConfig
+
+
+class TestConfigLoadCache:
+    """Tests for memoized config loading."""
+
+    def test_local_config_applied(self, tmp_path):
+        """A .livemathtex.toml next to the document is applied."""
+        (tmp_path / ".livemathtex.toml").write_text("digits = 7\n")
+        doc = tmp_path / "doc.md"
+        doc.write_text("$x := 1$\n")
+
+        config = LivemathConfig.load(doc)
+        assert config.digits == 7
+
+    def test_repeated_load_reuses_config(self, tmp_path):
+        """Documents sharing the same config files get the same cached config."""
+        (tmp_path / ".livemathtex.toml").write_text("digits = 6\n")
+        doc_a = tmp_path / "a.md"
+        doc_b = tmp_path / "b.md"
+        doc_a.write_text("")
+        doc_b.write_text("")
+
+        assert LivemathConfig.load(doc_a) is LivemathConfig.load(doc_b)
+
+    def test_edited_config_invalidates_cache(self, tmp_path):
+        """Changing a config file is picked up on the next load."""
+        local = tmp_path / ".livemathtex.toml"
+        local.write_text("digits = 5\n")
+        doc = tmp_path / "doc.md"
+        doc.write_text("")
+        assert LivemathConfig.load(doc).digits == 5
+
+        local.write_text("digits = 12\nformat = \"scientific\"\n")
+        config = LivemathConfig.load(doc)
+        assert config.digits == 12
+        assert config.format == "scientific"
+
+    def test_new_pyproject_found_after_clear_cache(self, tmp_path):
+        """A pyproject.toml created after a lookup is found once caches are cleared."""
+        project = tmp_path / "project"
+        docs = project / "docs"
+        docs.mkdir(parents=True)
+        doc = docs / "doc.md"
+        doc.write_text("")
+        LivemathConfig.load(doc)
+
+        (project / "pyproject.toml").write_text("[tool.livemathtex]\ndigits = 9\n")
+        LivemathConfig.clear_cache()
+        assert LivemathConfig.load(doc).digits == 9
+
+    def test_removed_pyproject_is_not_used(self, tmp_path):
+        """Deleting a previously found pyproject.toml does not break loading."""
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text("[tool.livemathtex]\ndigits = 9\n")
+        doc = tmp_path / "doc.md"
+        doc.write_text("")
+        assert LivemathConfig.load(doc).digits == 9
+
+        pyproject.unlink()
+        assert LivemathConfig.load(doc).digits != 9
+
+    def test_no_config_files_returns_defaults(self, tmp_path, monkeypatch):
+        """Without any config file, load() returns the default config."""
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path / "home")
+        doc = tmp_path / "doc.md"
+        doc.write_text("")
+        assert LivemathConfig.load(doc) == LivemathConfig()
+
+
+class TestWithOverrides:
+    """Tests for LivemathConfig.with_overrides."""
+
+    def test_unknown_and_method_names_ignored(self):
+        """Only config fields are applied; names of methods are not fields."""
+        config = LivemathConfig().with_overrides(
+            {"digits": 6, "load": 1, "resolve_output_path": "x", "nope": 2}
+        )
+        assert config.digits == 6
+        assert config == LivemathConfig(digits=6)
+
+    def test_no_valid_overrides_returns_self(self):
+        """With nothing to apply, the same instance is returned."""
+        config = LivemathConfig()
+        assert config.with_overrides({"digits": None, "nope": 1}) is config
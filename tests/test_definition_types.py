@@ -273,3 +273,18 @@ class TestEvaluationOfUndefinedSymbol:
         assert "\\color{red}" in result, (
             f"Expected error for undefined x evaluation. Result: {result}"
         )
+
+
+class TestIdenticalBlocksOnOneLine:
+    """Test that identical math blocks on one line get their own results."""
+
+    def test_each_block_shows_value_at_its_position(self):
+        """
+        Two identical $x ==$ blocks on one line reflect the definition before each.
+        """
+        content = "$x := 1$ $x ==$ $x := 2$ $x ==$\n"
+        result, ir = process_text(content)
+
+        assert result.startswith("$x := 1$ $x == 1$ $x := 2$ $x == 2$"), (
+            f"Expected each evaluation to use the preceding definition. Result: {result}"
+        )
@@ -112,3 +112,20 @@ $b_1 ==$'''
         # New evaluations should be present
         assert '10' in result
         assert '20' in result
+
+
+class TestErrorCounting:
+    """Test that evaluation errors are counted in the stats."""
+
+    def test_undefined_symbol_counted(self):
+        """Only the failing evaluation is counted as an error."""
+        content = '$x_1 := 42$\n$x_1 ==$\n$y_1 ==$'
+        result, ir = process_text(content)
+
+        assert ir.stats['errors'] == 1
+        assert result.count('\\color{red}') == 1
+
+    def test_no_errors(self):
+        """Successful evaluations are not counted."""
+        _, ir = process_text('$x_1 := 42$\n$x_1 ==$')
+        assert ir.stats['errors'] == 0
@@ -8,6 +8,7 @@ TDD: RED phase - all tests should fail until parser is implemented.
 
 import pytest
 
+from livemathtex.engine.pint_backend import define_custom_unit, reset_unit_registry
 from livemathtex.parser.expression_tokenizer import ExpressionTokenizer, Token, TokenType
 from livemathtex.parser.expression_parser import (
     ExpressionParser,
@@ -19,6 +20,7 @@ from livemathtex.parser.expression_parser import (
     FracNode,
     UnitAttachNode,
     ParseError,
+    parse_expression,
 )
 
 
@@ -613,3 +615,33 @@ class TestEdgeCases:
         """Only an operator should error."""
         with pytest.raises(ParseError):
             parse("+")
+
+
+# =============================================================================
+# Cached Parsing
+# =============================================================================
+
+
+class TestParseExpressionCache:
+    """Test parse_expression() memoization of expression trees."""
+
+    def teardown_method(self):
+        reset_unit_registry()
+
+    def test_repeated_expression_reuses_tree(self):
+        """The same text parses to the same (shared) tree."""
+        tree = parse_expression("a + b \\cdot 2")
+        assert parse_expression("a + b \\cdot 2") is tree
+        assert tree == parse("a + b \\cdot 2")
+
+    def test_defining_unit_invalidates_cache(self):
+        """A unit defined after a parse is recognized by the next parse."""
+        tree = parse_expression("a + b")
+        with pytest.raises(ParseError):
+            parse_expression("5\\ wdgt")
+
+        assert define_custom_unit("wdgt = 2 * kg")
+        assert parse_expression("a + b") is not tree
+        result = parse_expression("5\\ wdgt")
+        assert isinstance(result, UnitAttachNode)
+        assert result.unit == "wdgt"
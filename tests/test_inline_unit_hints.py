@@ -64,6 +64,15 @@ class TestInlineUnitHintParsing:
         assert calcs[0].operation == ':=_=='
         assert calcs[0].unit_comment == 'kJ'
 
+    def test_extracted_list_is_not_shared(self):
+        """Extraction is memoized, but each caller gets its own list."""
+        lexer = Lexer()
+        block = lexer.parse('$E == [kJ]$').children[0]
+
+        first = lexer.extract_calculations(block)
+        first.clear()
+        assert len(lexer.extract_calculations(block)) == 1
+
 
 class TestInlineUnitHintConversion:
     """Test full pipeline with inline unit hints."""
@@ -18,6 +18,7 @@ from livemathtex.engine.pint_backend import (
     parse_value_with_unit,
     convert_quantity,
     to_si_base,
+    convert_to_base_units,
     define_custom_unit,
     reset_unit_registry,
     clean_latex_unit,
@@ -266,6 +267,44 @@ class TestToSIBase:
         assert "m" in str(unit).lower() or "meter" in str(unit).lower()
 
 
+class TestConvertToBaseUnits:
+    """Tests for convert_to_base_units (base-unit factor is memoized)."""
+
+    def setup_method(self):
+        reset_unit_registry()
+
+    def test_repeated_unit_scales_cached_factor(self):
+        """The same unit with different values gives independent results."""
+        first = convert_to_base_units(5.0, "kW")
+        second = convert_to_base_units(2.0, "kW")
+        assert first.success and second.success
+        assert first.base_value == 5000.0
+        assert second.base_value == 2000.0
+        assert first.base_unit == second.base_unit
+
+    def test_invalid_unit_reports_error(self):
+        """An unknown unit fails every time (errors are not cached)."""
+        for _ in range(2):
+            result = convert_to_base_units(1.0, "notaunit")
+            assert result.success is False
+            assert result.error
+
+    def test_custom_unit_defined_after_lookup(self):
+        """A unit defined after a failed lookup converts afterwards."""
+        assert convert_to_base_units(1.0, "mybarx").success is False
+        assert define_custom_unit("mybarx === 100000 * Pa")
+        result = convert_to_base_units(2.0, "mybarx")
+        assert result.success is True
+        assert result.base_value == 200000.0
+
+    def test_offset_unit_is_not_scaled(self):
+        """Offset units (degC) go through Pint, not a cached factor."""
+        result = convert_to_base_units(25.0, "degC")
+        # Pint refuses to multiply a value into an offset unit
+        assert result.success is False
+        assert (result.base_value, result.base_unit) == (25.0, "degC")
+
+
 class TestCustomUnits:
     """Tests for custom unit definitions."""
 